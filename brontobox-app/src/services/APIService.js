@@ -370,6 +370,12 @@ export class APIService {
     return response.data;
   }
 
+  // Deletes several chunks of one account in a single Drive batch request
+  static async deleteRawChunks(accountId, fileIds) {
+    const response = await api.post(`/drive/chunks/${accountId}/delete`, { file_ids: fileIds });
+    return response.data;
+  }
+
   static async getBrontoBoxFolderInfo(accountId) {
     const response = await api.get(`/drive/folder-info/${accountId}`);
     return response.data;
@@ -515,7 +521,9 @@ export class APIService {
     const connect = () => {
       try {
         console.log('Attempting WebSocket connection...');
-        ws = new WebSocket('ws://127.0.0.1:8000/ws');
+        // The "json" subprotocol asks for broadcasts as binary frames of UTF-8 JSON
+        ws = new WebSocket('ws://127.0.0.1:8000/ws', ['json']);
+        ws.binaryType = 'arraybuffer';
         
         ws.onopen = () => {
           console.log('WebSocket connected successfully');
@@ -535,9 +543,16 @@ export class APIService {
         
         ws.onmessage = (event) => {
           try {
-            const data = JSON.parse(event.data);
-            console.log('WebSocket message:', data);
-            if (onMessage) onMessage(data);
+            const text = typeof event.data === 'string'
+              ? event.data
+              : new TextDecoder().decode(event.data);
+            const data = JSON.parse(text);
+            // Messages sent in a burst arrive batched as one array frame
+            const messages = Array.isArray(data) ? data : [data];
+            for (const message of messages) {
+              console.log('WebSocket message:', message);
+              if (onMessage) onMessage(message);
+            }
           } catch (error) {
             console.error('WebSocket message parse error:', error);
             if (onMessage) onMessage({ type: 'echo', data: event.data });
@@ -6,17 +6,24 @@ Includes proper vault authentication, data isolation, and file auto-discovery
 """
 
 import os
-import json
 import asyncio
 import hashlib
 import base64
 import time
 import sys
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Callable, Union
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote
 import tempfile
 import shutil
+import itertools
+import operator
+import threading
+import queue
+import atexit
+import logging
+import logging.handlers
 
 
 # PRODUCTION FIX: Set UTF-8 encoding for console output
@@ -30,11 +37,14 @@ if sys.platform == "win32":
         # Fallback: disable emoji/unicode characters
         pass
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
+import orjson
 
 # Import your existing BrontoBox components
 from vault_core import VaultCore
@@ -67,14 +77,8 @@ class RestoreRequest(BaseModel):
     registry_backup_file: Optional[str] = None
     master_password: str
 
-class StorageInfo(BaseModel):
-    total_accounts: int
-    total_capacity_gb: float
-    total_used_gb: float
-    total_available_gb: float
-    usage_percentage: float
-    accounts: List[Dict[str, Any]]
-    workspace_summary: Optional[Dict[str, Any]] = None  # New field
+class ChunkDeleteRequest(BaseModel):
+    file_ids: List[str]
 
 class FileInfo(BaseModel):
     file_id: str
@@ -93,14 +97,47 @@ app_state = {
     "storage_manager": None,
     "vault_unlocked": False,
     "active_uploads": {},
-    "websocket_connections": []
+    "websocket_connections": [],
+    "response_cache": {}
 }
 
+# Buffer size used when spilling uploads to disk
+UPLOAD_BLOCK_SIZE = 4 * 1024 * 1024
+# Default and maximum page sizes for paged listings
+FILES_PAGE_SIZE = 200
+MAX_FILES_PAGE_SIZE = 1000
+# Uploads up to this size skip the temp file and are encrypted from memory
+SMALL_UPLOAD_LIMIT = 32 * 1024 * 1024
+# Spill files kept for reuse by large uploads
+SPILL_POOL_SIZE = os.cpu_count() or 2
+
+# Log records are queued by the caller and written to stderr by a listener thread,
+# so request handlers and worker threads never block on console I/O
+_log_queue = queue.SimpleQueue()
+logger = logging.getLogger("brontobox")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+class BrontoBoxJSONResponse(JSONResponse):
+    """
+    orjson-backed responses; non-string keys are allowed, as with json.dumps.
+    Large listings return one directly so FastAPI skips its jsonable_encoder pass
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="BrontoBox API",
     description="Secure Distributed Storage API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=BrontoBoxJSONResponse
 )
 
 # Enable CORS for Electron frontend
@@ -112,62 +149,306 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class APIGZipMiddleware:
+    """
+    GZip API responses, but pass file downloads straight through: chunk data is
+    AES-GCM ciphertext, so compressing it only burns CPU and drops Content-Length
+    """
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+    
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] == "http" and not (path.endswith("/download") or path.startswith("/drive/download/")):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+app.add_middleware(APIGZipMiddleware, minimum_size=1024)
+
 # WebSocket connection manager
+# Each client gets a bounded outbound queue drained by its own writer task.
+# Messages queued while a send is in flight are coalesced into one JSON array frame.
+# Clients that offer the "json" subprotocol get binary frames carrying UTF-8 JSON,
+# sent exactly as encoded; other clients get the same JSON as text frames.
+# A client that can't take a frame within CLIENT_SEND_TIMEOUT is disconnected.
+CLIENT_QUEUE_SIZE = 256
+MAX_FRAME_BATCH = 16
+CLIENT_SEND_TIMEOUT = 10  # seconds
+JSON_SUBPROTOCOL = "json"
+# Batched frames are assembled here. Assembly never awaits, so writers on the
+# event loop can share one buffer instead of allocating intermediates per frame
+_frame_buffer = bytearray()
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.client_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.writer_tasks: Dict[WebSocket, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket):
-        await websocket.accept()
+        binary = JSON_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+        await websocket.accept(subprotocol=JSON_SUBPROTOCOL if binary else None)
         self.active_connections.append(websocket)
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.client_queues[websocket] = queue
+        self.writer_tasks[websocket] = asyncio.create_task(self._writer(websocket, queue, binary))
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
-
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
+        self.client_queues.pop(websocket, None)
+        task = self.writer_tasks.pop(websocket, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
+
+    def send_personal_message(self, message: dict, websocket: WebSocket):
+        # Goes through the client's writer, so replies are batched like broadcasts
+        queue = self.client_queues.get(websocket)
+        if queue is not None:
+            self._enqueue(queue, orjson.dumps(message))
+
+    def broadcast(self, message: dict):
+        # Serialize once and hand the payload to every client's writer. Nothing
+        # here awaits, so handlers enqueue and return without waiting on sockets
+        if not self.client_queues:
+            return
+        payload = orjson.dumps(message)
+        for queue in self.client_queues.values():
+            self._enqueue(queue, payload)
+
+    @staticmethod
+    def _enqueue(queue: asyncio.Queue, payload: bytes):
+        # A slow client only backs up its own queue, losing its oldest messages first
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(payload)
+
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue, binary: bool):
+        """Send queued messages to one client, batching whatever piled up meanwhile"""
+        try:
+            while True:
+                batch = [await queue.get()]
+                while len(batch) < MAX_FRAME_BATCH and not queue.empty():
+                    batch.append(queue.get_nowait())
+                # Payloads are already JSON, so a batch is joined rather than re-encoded
+                if len(batch) == 1:
+                    frame = batch[0]
+                else:
+                    _frame_buffer.clear()
+                    _frame_buffer += b"["
+                    for index, payload in enumerate(batch):
+                        if index:
+                            _frame_buffer += b","
+                        _frame_buffer += payload
+                    _frame_buffer += b"]"
+                    frame = _frame_buffer
+                # Copy out of the shared buffer before the first await
+                if binary:
+                    send = websocket.send_bytes(bytes(frame))
+                else:
+                    send = websocket.send_text(frame.decode('utf-8'))
+                await asyncio.wait_for(send, CLIENT_SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            # A stalled client: drop it rather than keep buffering for it
+            self.disconnect(websocket)
             try:
-                await connection.send_json(message)
-            except:
-                # Remove disconnected connections
-                self.active_connections.remove(connection)
+                await asyncio.wait_for(websocket.close(code=1008), 1)
+            except Exception:
+                pass
+        except Exception:
+            # Remove disconnected connections
+            self.disconnect(websocket)
 
 manager = ConnectionManager()
 
+# JSON FILE HELPERS
+
+def read_json_file(path: str) -> Any:
+    """Read and parse a JSON file"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def write_json_file(path: str, data: Any, indent: bool = False, durable: bool = False):
+    """Serialize data and write it to a JSON file in one call (atomically and fsynced if durable)"""
+    option = orjson.OPT_INDENT_2 if indent else 0
+    payload = orjson.dumps(data, option=option)
+    if durable:
+        atomic_write_bytes(path, payload)
+        return
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+def atomic_write_bytes(path: str, payload: bytes):
+    """Durably replace a file: write a temp file, fsync it, then rename it over path"""
+    # Unique per process and thread, so concurrent writers never share a temp file
+    tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o600)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Never leave a half-written temp file behind; the original is untouched
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    
+    # Make the rename itself durable (directories can't be opened on Windows)
+    if sys.platform != "win32":
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+# RESPONSE CACHE HELPERS
+# Drive quota lookups are slow, so polled endpoints keep their serialized
+# response for a short TTL and answer If-None-Match with 304
+
+RESPONSE_CACHE_TTL = 30  # seconds
+
+def get_cached_response(key: str) -> Optional[Tuple[str, bytes]]:
+    """Return (etag, body) for a cached response that has not expired"""
+    entry = app_state["response_cache"].get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1], entry[2]
+    return None
+
+def cache_response(key: str, payload: Any, ttl: float = RESPONSE_CACHE_TTL) -> Tuple[str, bytes]:
+    """Serialize a response payload, tag it and cache it"""
+    body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    app_state["response_cache"][key] = (time.monotonic() + ttl, etag, body)
+    return etag, body
+
+def invalidate_response_cache():
+    """Drop all cached responses after a change to accounts or files"""
+    global _accounts_snapshot
+    app_state["response_cache"].clear()
+    _accounts_snapshot = None
+
+# auth_manager.list_accounts() makes a quota request per account; endpoints
+# polled together share one result for the response cache TTL
+_accounts_snapshot: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+
+async def get_accounts_snapshot() -> List[Dict[str, Any]]:
+    """Return list_accounts() output, reusing a recent result (entries are copies)"""
+    global _accounts_snapshot
+    snapshot = _accounts_snapshot
+    if snapshot is None or snapshot[0] <= time.monotonic():
+        accounts = await run_in_threadpool(app_state["auth_manager"].list_accounts)
+        snapshot = (time.monotonic() + RESPONSE_CACHE_TTL, accounts)
+        _accounts_snapshot = snapshot
+    return [dict(account) for account in snapshot[1]]
+
+def etag_response(request: Request, etag: str, body: bytes) -> Response:
+    """Return the cached body, or 304 if the client already has this version"""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+async def file_exists(path: str) -> bool:
+    """os.path.exists without blocking the event loop on slow filesystems"""
+    return await run_in_threadpool(os.path.exists, path)
+
+def spill_upload(source, path: str, head: bytes = b""):
+    """Write an upload to a spill file in large blocks (run in a thread)"""
+    with open(path, 'wb', buffering=0) as temp_file:
+        temp_file.write(head)
+        shutil.copyfileobj(source, temp_file, UPLOAD_BLOCK_SIZE)
+
+# Large uploads reuse a small pool of spill files instead of creating and
+# unlinking a fresh temp file per request
+_spill_pool = queue.SimpleQueue()
+
+def acquire_spill_file() -> str:
+    """Take a spill file from the pool, creating one if the pool is empty"""
+    try:
+        return _spill_pool.get_nowait()
+    except queue.Empty:
+        fd, path = tempfile.mkstemp(prefix="brontobox_spill_")
+        os.close(fd)
+        return path
+
+def release_spill_file(path: str):
+    """Empty a spill file and return it to the pool, or delete it if the pool is full"""
+    try:
+        if _spill_pool.qsize() < SPILL_POOL_SIZE:
+            os.truncate(path, 0)
+            _spill_pool.put(path)
+        else:
+            os.remove(path)
+    except OSError as e:
+        logger.warning("Could not recycle spill file %s: %s", path, e)
+
+@atexit.register
+def drain_spill_pool():
+    """Remove pooled spill files on shutdown"""
+    while True:
+        try:
+            path = _spill_pool.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+async def remove_file(path: str) -> bool:
+    """Remove a file off the event loop; returns False if it was already gone"""
+    try:
+        await run_in_threadpool(os.remove, path)
+        return True
+    except FileNotFoundError:
+        return False
+
 # SECURE VAULT MANAGEMENT FUNCTIONS
 
 def get_vault_registry_path() -> str:
     """Get path to vault registry file"""
     return "brontobox_vault_registry.json"
 
+# Persistence writes run in the threadpool; these locks keep concurrent
+# read-modify-write cycles on the same file from interleaving
+_vault_registry_lock = threading.Lock()
+_registry_write_lock = threading.RLock()
+
 def save_vault_to_registry(vault_id: str, vault_data: Dict[str, Any]) -> bool:
     """Save vault information to secure registry"""
     try:
         registry_path = get_vault_registry_path()
         
-        # Load existing registry or create new
-        if os.path.exists(registry_path):
-            with open(registry_path, 'r') as f:
-                registry = json.load(f)
-        else:
-            registry = {"vaults": {}, "created_at": datetime.now().isoformat()}
-        
-        # Add/update vault
-        registry["vaults"][vault_id] = {
-            "vault_id": vault_id,
-            "salt": vault_data["salt"],
-            "verification_data": vault_data["verification_data"],
-            "created_at": vault_data.get("created_at", datetime.now().isoformat()),
-            "version": vault_data.get("version", "1.0"),
-            "last_accessed": datetime.now().isoformat()
-        }
-        
-        # Save registry
-        with open(registry_path, 'w') as f:
-            json.dump(registry, f, indent=2)
+        with _vault_registry_lock:
+            # Load existing registry or create new
+            try:
+                registry = read_json_file(registry_path)
+            except FileNotFoundError:
+                registry = {"vaults": {}, "created_at": datetime.now().isoformat()}
+            
+            # Add/update vault
+            registry["vaults"][vault_id] = {
+                "vault_id": vault_id,
+                "salt": vault_data["salt"],
+                "verification_data": vault_data["verification_data"],
+                "created_at": vault_data.get("created_at", datetime.now().isoformat()),
+                "version": vault_data.get("version", "1.0"),
+                "last_accessed": datetime.now().isoformat()
+            }
+            
+            # Save registry
+            write_json_file(registry_path, registry, indent=True, durable=True)
+            invalidate_vault_registry_cache()
             
         print(f"Vault {vault_id} saved to registry")
         return True
@@ -176,21 +457,70 @@ def save_vault_to_registry(vault_id: str, vault_data: Dict[str, Any]) -> bool:
         print(f"Failed to save vault to registry: {e}")
         return False
 
+def remove_vault_from_registry(vault_id: str) -> bool:
+    """Remove a vault from the registry; returns True if it was listed"""
+    registry_path = get_vault_registry_path()
+    
+    with _vault_registry_lock:
+        try:
+            registry = read_json_file(registry_path)
+        except FileNotFoundError:
+            return False
+        if vault_id not in registry.get("vaults", {}):
+            return False
+        del registry["vaults"][vault_id]
+        write_json_file(registry_path, registry, indent=True, durable=True)
+        invalidate_vault_registry_cache()
+    return True
+
+# Parsed vault registry with a salt -> vault index, keyed by the file's mtime and size
+_vault_registry_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any], Dict[str, Dict[str, Any]]]] = None
+
+def read_vault_registry() -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Return the vaults in the registry by ID and by salt, re-reading the file only
+    when it has changed. The returned dicts are shared, so callers must copy
+    entries before modifying them
+    """
+    global _vault_registry_cache
+    try:
+        st = os.stat(get_vault_registry_path())
+    except FileNotFoundError:
+        return {}, {}
+    
+    stamp = (st.st_mtime_ns, st.st_size)
+    cache = _vault_registry_cache
+    if cache and cache[0] == stamp:
+        return cache[1], cache[2]
+    
+    vaults = read_json_file(get_vault_registry_path()).get("vaults", {})
+    vaults_by_salt = index_by(vaults.values(), lambda vault_info: vault_info.get("salt"))
+    _vault_registry_cache = (stamp, vaults, vaults_by_salt)
+    return vaults, vaults_by_salt
+
+def invalidate_vault_registry_cache():
+    """Drop the parsed registry after writing it (mtime alone can miss fast rewrites)"""
+    global _vault_registry_cache
+    _vault_registry_cache = None
+    app_state["response_cache"].pop("vault_list", None)
+
+def find_vault_by_salt(salt: str) -> Optional[Dict[str, Any]]:
+    """Look up a registered vault by its salt"""
+    try:
+        vault_info = read_vault_registry()[1].get(salt)
+        return dict(vault_info) if vault_info else None
+    except Exception as e:
+        print(f"Failed to load vault from registry: {e}")
+        return None
+
 def load_vault_from_registry(vault_id: str = None) -> Optional[Dict[str, Any]]:
     """Load vault information from registry"""
     try:
-        registry_path = get_vault_registry_path()
-        
-        if not os.path.exists(registry_path):
-            return None
-            
-        with open(registry_path, 'r') as f:
-            registry = json.load(f)
-        
-        vaults = registry.get("vaults", {})
+        vaults = read_vault_registry()[0]
         
         if vault_id:
-            return vaults.get(vault_id)
+            vault_info = vaults.get(vault_id)
+            return dict(vault_info) if vault_info else None
         else:
             # Return most recently accessed vault
             if not vaults:
@@ -198,7 +528,7 @@ def load_vault_from_registry(vault_id: str = None) -> Optional[Dict[str, Any]]:
             
             latest_vault = max(vaults.values(), 
                              key=lambda v: v.get("last_accessed", ""))
-            return latest_vault
+            return dict(latest_vault)
             
     except Exception as e:
         print(f"Failed to load vault from registry: {e}")
@@ -207,15 +537,7 @@ def load_vault_from_registry(vault_id: str = None) -> Optional[Dict[str, Any]]:
 def list_vaults_from_registry() -> List[Dict[str, Any]]:
     """List all registered vaults"""
     try:
-        registry_path = get_vault_registry_path()
-        
-        if not os.path.exists(registry_path):
-            return []
-            
-        with open(registry_path, 'r') as f:
-            registry = json.load(f)
-        
-        return list(registry.get("vaults", {}).values())
+        return [dict(vault_info) for vault_info in read_vault_registry()[0].values()]
         
     except Exception as e:
         print(f"Failed to list vaults: {e}")
@@ -229,46 +551,316 @@ def get_registry_file_path(vault_id: str) -> str:
     """Get file registry path for specific vault"""
     return f"brontobox_file_registry_{vault_id}.json"
 
-# Registry persistence helpers - updated for vault-specific storage
-def save_file_registry_to_disk():
-    """Save file registry to disk for persistence"""
+def get_registry_journal_path(vault_id: str) -> str:
+    """Get file registry journal path for specific vault"""
+    return f"brontobox_file_registry_{vault_id}.log"
+
+# Names of the files in the working directory (where all persistence files live),
+# from one directory read shared by status polls for PERSISTED_FILES_TTL seconds
+PERSISTED_FILES_TTL = 1.0
+_persisted_files_cache: Tuple[float, frozenset] = (0.0, frozenset())
+
+def list_persisted_files() -> frozenset:
+    """Return the file names in the working directory, rescanning at most once per TTL"""
+    global _persisted_files_cache
+    expires, names = _persisted_files_cache
+    if expires > time.monotonic():
+        return names
+    
+    with os.scandir(".") as entries:
+        names = frozenset(entry.name for entry in entries)
+    _persisted_files_cache = (time.monotonic() + PERSISTED_FILES_TTL, names)
+    return names
+
+# Account persistence helpers - auth_manager.accounts is the in-memory copy,
+# the accounts file is only read on unlock and written in the background
+_background_tasks = set()
+# Newest unsaved snapshot per vault, and the flush currently writing them
+_pending_accounts: Dict[str, Dict[str, Any]] = {}
+_accounts_flush: Optional[asyncio.Future] = None
+
+def load_accounts_from_disk(auth_manager, vault_id: str) -> bool:
+    """Load encrypted accounts for a vault, removing the file if it is corrupted"""
+    accounts_file = get_accounts_file_path(vault_id)
     try:
-        storage_manager = app_state["storage_manager"]
-        vault = app_state.get("vault")
-        
-        if storage_manager and vault and vault.vault_id and len(storage_manager.stored_files) > 0:
-            encrypted_registry = storage_manager.save_file_registry()
-            registry_file = get_registry_file_path(vault.vault_id)
-            with open(registry_file, 'w') as f:
-                json.dump(encrypted_registry, f)
-            print(f"File registry auto-saved for vault {vault.vault_id} ({len(storage_manager.stored_files)} files)")
-            return True
+        encrypted_accounts = read_json_file(accounts_file)
+        success = auth_manager.load_accounts_from_vault(encrypted_accounts)
+        if not success:
+            print("Warning: Could not load accounts - vault keys may be different")
+        return success
+    except FileNotFoundError:
+        return False
     except Exception as e:
-        print(f"Could not auto-save registry: {e}")
+        print(f"Warning: Could not load accounts: {e}")
+        # Remove corrupted accounts file
+        try:
+            os.remove(accounts_file)
+            print("Removed corrupted accounts file")
+        except:
+            pass
     return False
 
-def load_file_registry_from_disk():
-    """Load file registry from disk"""
+def write_accounts_file(vault_id: str, encrypted_accounts: Dict[str, Any]):
+    """Write already-encrypted accounts to the vault-specific accounts file"""
+    atomic_write_bytes(get_accounts_file_path(vault_id), orjson.dumps(encrypted_accounts))
+
+async def flush_pending_accounts():
+    """Write pending account snapshots until none are left"""
+    global _accounts_flush
     try:
-        storage_manager = app_state["storage_manager"]
-        vault = app_state.get("vault")
-        
-        if not storage_manager or not vault or not vault.vault_id:
-            return False
+        while _pending_accounts:
+            vault_id = next(iter(_pending_accounts))
+            encrypted_accounts = _pending_accounts.pop(vault_id)
+            try:
+                await run_in_threadpool(write_accounts_file, vault_id, encrypted_accounts)
+            except Exception as e:
+                logger.warning("Could not save accounts: %s", e)
+    finally:
+        _accounts_flush = None
+
+async def persist_accounts(vault_id: str, encrypted_accounts: Dict[str, Any]):
+    """
+    Write accounts off the event loop. Saves requested while a write is running
+    are coalesced, so a burst costs at most one more write of the newest snapshot
+    """
+    global _accounts_flush
+    _pending_accounts[vault_id] = encrypted_accounts
+    if _accounts_flush is None:
+        _accounts_flush = asyncio.ensure_future(flush_pending_accounts())
+    await asyncio.shield(_accounts_flush)
+
+def schedule_accounts_save():
+    """Encrypt the current accounts now and persist them in a background task"""
+    auth_manager = app_state.get("auth_manager")
+    vault = app_state.get("vault")
+    if not auth_manager or not vault or not vault.vault_id:
+        return
+    
+    # Encrypt while the vault keys are guaranteed to be available
+    encrypted_accounts = auth_manager.save_accounts_to_vault()
+    task = asyncio.create_task(persist_accounts(vault.vault_id, encrypted_accounts))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+# Token refreshes in flight, so overlapping callers share one OAuth round trip
+_token_refresh_inflight: Dict[str, asyncio.Future] = {}
+
+async def refresh_credentials(auth_manager, account_id: str):
+    """Get (and refresh if needed) an account's credentials, joining any refresh already running"""
+    future = _token_refresh_inflight.get(account_id)
+    if future is None:
+        # No await between the lookup and the insert, so this is race-free on the event loop
+        future = asyncio.ensure_future(run_in_threadpool(auth_manager.get_credentials, account_id))
+        _token_refresh_inflight[account_id] = future
+        future.add_done_callback(lambda _: _token_refresh_inflight.pop(account_id, None))
+    return await asyncio.shield(future)
+
+# Registry persistence helpers - updated for vault-specific storage
+# The registry snapshot is rewritten on lock and, in the background, after
+# REGISTRY_COMPACT_EVERY journaled changes; single-file changes in between are
+# appended to a journal. Each record is fsynced before record_registry_change
+# returns, so an acknowledged upload or delete survives a crash or power loss
+REGISTRY_COMPACT_EVERY = 100
+_registry_journal_length = 0
+# (path, fd) of the open journal
+_registry_journal: Optional[Tuple[str, int]] = None
+_registry_compaction_pending = False
+
+def open_registry_journal(path: str) -> int:
+    """Return an append-only descriptor for the journal at path (call with the write lock held)"""
+    global _registry_journal
+    if _registry_journal and _registry_journal[0] == path:
+        return _registry_journal[1]
+    
+    close_registry_journal()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0), 0o600)
+    _registry_journal = (path, fd)
+    return fd
+
+@atexit.register
+def close_registry_journal():
+    """Close the journal"""
+    global _registry_journal
+    with _registry_write_lock:
+        if _registry_journal is None:
+            return
+        fd = _registry_journal[1]
+        _registry_journal = None
+        os.close(fd)
+
+def compact_registry():
+    """Fold the journal into a fresh snapshot (runs on its own thread)"""
+    global _registry_compaction_pending
+    try:
+        save_file_registry_to_disk(allow_empty=True)
+    finally:
+        _registry_compaction_pending = False
+
+def schedule_registry_compaction():
+    """Start a background compaction unless one is already running"""
+    global _registry_compaction_pending
+    with _registry_write_lock:
+        if _registry_compaction_pending:
+            return
+        _registry_compaction_pending = True
+    threading.Thread(target=compact_registry, name="registry-compaction").start()
+
+def save_file_registry_to_disk(storage_manager: Optional[BrontoBoxStorageManager] = None, vault: Optional[VaultCore] = None,
+                               allow_empty: bool = False):
+    """
+    Save file registry to disk for persistence (for the current vault unless one is given)
+    An empty registry is only written with allow_empty, i.e. when the journal has
+    recorded the removals that emptied it
+    """
+    global _registry_journal_length
+    with _registry_write_lock:
+        try:
+            storage_manager = storage_manager or app_state["storage_manager"]
+            vault = vault or app_state.get("vault")
+            
+            if storage_manager and vault and vault.vault_id and (allow_empty or len(storage_manager.stored_files) > 0):
+                encrypted_registry = storage_manager.save_file_registry()
+                registry_file = get_registry_file_path(vault.vault_id)
+                atomic_write_bytes(registry_file, orjson.dumps(encrypted_registry))
+                
+                # The snapshot now covers everything the journal recorded
+                close_registry_journal()
+                try:
+                    os.remove(get_registry_journal_path(vault.vault_id))
+                except FileNotFoundError:
+                    pass
+                _registry_journal_length = 0
+                
+                logger.info("File registry auto-saved for vault %s (%d files)", vault.vault_id, len(storage_manager.stored_files))
+                return True
+        except Exception as e:
+            logger.warning("Could not auto-save registry: %s", e)
+        return False
+
+def record_registry_change(file_id: str) -> bool:
+    """Persist one file's addition or removal by appending it to the registry journal"""
+    global _registry_journal_length
+    with _registry_write_lock:
+        try:
+            storage_manager = app_state["storage_manager"]
+            vault = app_state.get("vault")
+            
+            if not storage_manager or not vault or not vault.vault_id:
+                return False
+            
+            # The journal only makes sense on top of a snapshot
+            if not os.path.exists(get_registry_file_path(vault.vault_id)):
+                if save_file_registry_to_disk(allow_empty=True):
+                    return True
+            
+            encrypted_entry = storage_manager.encrypt_registry_entry(file_id)
+            fd = open_registry_journal(get_registry_journal_path(vault.vault_id))
+            line = orjson.dumps(encrypted_entry) + b"\n"
+            os.write(fd, line)
+            os.fsync(fd)
+            
+            _registry_journal_length += 1
+            if _registry_journal_length >= REGISTRY_COMPACT_EVERY:
+                schedule_registry_compaction()
+            return True
+        except Exception as e:
+            logger.warning("Could not record registry change: %s", e)
+        return False
+
+def replay_registry_journal(storage_manager: BrontoBoxStorageManager, vault_id: str) -> int:
+    """Apply registry changes journaled since the last snapshot; returns entries applied"""
+    global _registry_journal_length
+    journal_file = get_registry_journal_path(vault_id)
+    encrypted_entries = []
+    try:
+        with open(journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    encrypted_entries.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    # A torn final line from an interrupted append
+                    logger.warning("Skipping unreadable registry journal entry")
+    except FileNotFoundError:
+        _registry_journal_length = 0
+        return 0
+    
+    applied = storage_manager.replay_registry_journal(encrypted_entries)
+    _registry_journal_length = applied
+    return applied
+
+def load_file_registry_from_disk():
+    """Load file registry from disk (holds the write lock so journal appends wait)"""
+    with _registry_write_lock:
+        try:
+            storage_manager = app_state["storage_manager"]
+            vault = app_state.get("vault")
             
-        registry_file = get_registry_file_path(vault.vault_id)
-        if os.path.exists(registry_file):
-            with open(registry_file, 'r') as f:
-                encrypted_registry = json.load(f)
+            if not storage_manager or not vault or not vault.vault_id:
+                return False
+                
+            registry_file = get_registry_file_path(vault.vault_id)
+            success = False
+            try:
+                encrypted_registry = read_json_file(registry_file)
+            except FileNotFoundError:
+                encrypted_registry = None
+            if encrypted_registry is not None:
+                success = storage_manager.load_file_registry(encrypted_registry)
+            
+            if replay_registry_journal(storage_manager, vault.vault_id) > 0:
+                success = True
             
-            success = storage_manager.load_file_registry(encrypted_registry)
             if success:
                 files_loaded = len(storage_manager.stored_files)
-                print(f"Auto-loaded {files_loaded} files from registry for vault {vault.vault_id}")
+                logger.info("Auto-loaded %d files from registry for vault %s", files_loaded, vault.vault_id)
                 return True
-    except Exception as e:
-        print(f"Could not auto-load registry: {e}")
-    return False
+        except Exception as e:
+            logger.warning("Could not auto-load registry: %s", e)
+        return False
+
+def index_by(items: Iterable[Any], key: Union[str, Callable[[Any], Any]]) -> Dict[Any, Any]:
+    """Index items by a dict key (when key is a string) or by a key function"""
+    get_key = key if callable(key) else operator.itemgetter(key)
+    return {get_key(item): item for item in items}
+
+# Listing endpoints page with an opaque cursor naming where the next page starts
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """Encode a listing position as an opaque, URL-safe cursor"""
+    return base64.urlsafe_b64encode(orjson.dumps(position)).decode('ascii')
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor; raises 400 if it is malformed"""
+    try:
+        position = orjson.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, UnicodeEncodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(position, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+def content_disposition(filename: str) -> str:
+    """Build an attachment Content-Disposition header, as FileResponse does"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+def json_attachment(data: Any, filename: str) -> Response:
+    """Serve data as a downloadable, indented JSON file without going through disk"""
+    return Response(
+        content=orjson.dumps(data, option=orjson.OPT_INDENT_2),
+        media_type='application/json',
+        headers={"Content-Disposition": content_disposition(filename)}
+    )
+
+def require_storage_manager() -> BrontoBoxStorageManager:
+    """Return the storage manager, raising 401 if the vault is locked"""
+    if not app_state["vault_unlocked"]:
+        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = app_state["storage_manager"]
+    if not storage_manager:
+        raise HTTPException(status_code=500, detail="Storage manager not initialized")
+    return storage_manager
 
 # API Endpoints
 
@@ -309,13 +901,13 @@ async def initialize_vault(request: VaultInitRequest):
     try:
         # Initialize vault
         vault = VaultCore()
-        init_data = vault.initialize_vault(request.master_password)
+        init_data = await run_in_threadpool(vault.initialize_vault, request.master_password)
         
         # Initialize auth manager
         auth_manager = GoogleAuthManager(vault)
         
         # Initialize storage manager
-        storage_manager = BrontoBoxStorageManager(vault, auth_manager)
+        storage_manager = await run_in_threadpool(BrontoBoxStorageManager, vault, auth_manager)
         
         # Store in global state
         app_state["vault"] = vault
@@ -332,10 +924,11 @@ async def initialize_vault(request: VaultInitRequest):
             "version": init_data.get("version", "1.0")
         }
         
-        if not save_vault_to_registry(init_data["vault_id"], vault_data):
+        if not await run_in_threadpool(save_vault_to_registry, init_data["vault_id"], vault_data):
             raise HTTPException(status_code=500, detail="Failed to save vault securely")
         
-        await manager.broadcast({
+        invalidate_response_cache()
+        manager.broadcast({
             "type": "vault_initialized",
             "data": {"status": "Vault initialized successfully"}
         })
@@ -356,13 +949,7 @@ async def unlock_vault(request: VaultUnlockRequest):
     """Unlock existing vault with SECURE verification"""
     try:
         # Try to find vault by salt (since user only provides salt, not vault_id)
-        all_vaults = list_vaults_from_registry()
-        matching_vault = None
-        
-        for vault_info in all_vaults:
-            if vault_info["salt"] == request.salt:
-                matching_vault = vault_info
-                break
+        matching_vault = await run_in_threadpool(find_vault_by_salt, request.salt)
         
         if not matching_vault:
             raise HTTPException(status_code=404, detail="No vault found with this salt")
@@ -370,11 +957,13 @@ async def unlock_vault(request: VaultUnlockRequest):
         # Initialize vault
         vault = VaultCore()
         
-        # SECURE: Unlock with verification data
-        success = vault.unlock_vault(
+        # SECURE: Unlock with verification data (key derivation runs off the event loop)
+        success = await run_in_threadpool(
+            vault.unlock_vault,
             request.master_password, 
             request.salt,
-            matching_vault["verification_data"]
+            matching_vault["verification_data"],
+            remember=True
         )
         
         if not success:
@@ -384,25 +973,10 @@ async def unlock_vault(request: VaultUnlockRequest):
         auth_manager = GoogleAuthManager(vault)
         
         # Try to load existing accounts for this specific vault
-        accounts_file = get_accounts_file_path(matching_vault["vault_id"])
-        if os.path.exists(accounts_file):
-            try:
-                with open(accounts_file, 'r') as f:
-                    encrypted_accounts = json.load(f)
-                success = auth_manager.load_accounts_from_vault(encrypted_accounts)
-                if not success:
-                    print("Warning: Could not load accounts - vault keys may be different")
-            except Exception as e:
-                print(f"Warning: Could not load accounts: {e}")
-                # Remove corrupted accounts file
-                try:
-                    os.remove(accounts_file)
-                    print("Removed corrupted accounts file")
-                except:
-                    pass
+        await run_in_threadpool(load_accounts_from_disk, auth_manager, matching_vault["vault_id"])
         
         # Initialize storage manager
-        storage_manager = BrontoBoxStorageManager(vault, auth_manager)
+        storage_manager = await run_in_threadpool(BrontoBoxStorageManager, vault, auth_manager)
         
         # Store in global state
         app_state["vault"] = vault
@@ -410,21 +984,14 @@ async def unlock_vault(request: VaultUnlockRequest):
         app_state["storage_manager"] = storage_manager
         app_state["vault_unlocked"] = True
         
-        # Auto-load file registry for this vault
-        registry_file = get_registry_file_path(matching_vault["vault_id"])
-        if os.path.exists(registry_file):
-            try:
-                with open(registry_file, 'r') as f:
-                    encrypted_registry = json.load(f)
-                storage_manager.load_file_registry(encrypted_registry)
-            except Exception as e:
-                print(f"Warning: Could not load file registry: {e}")
+        # Auto-load file registry (snapshot + journal) for this vault
+        await run_in_threadpool(load_file_registry_from_disk)
         
         # TRIGGER AUTO-DISCOVERY after vault unlock
         if len(auth_manager.accounts) > 0:
             print(f"Triggering file discovery for {len(auth_manager.accounts)} accounts...")
             old_count = len(storage_manager.stored_files)
-            storage_manager.refresh_file_discovery()
+            await run_in_threadpool(storage_manager.refresh_file_discovery)
             new_count = len(storage_manager.stored_files)
             discovered = new_count - old_count
             
@@ -433,9 +1000,10 @@ async def unlock_vault(request: VaultUnlockRequest):
         
         # Update last accessed time
         matching_vault["last_accessed"] = datetime.now().isoformat()
-        save_vault_to_registry(matching_vault["vault_id"], matching_vault)
+        await run_in_threadpool(save_vault_to_registry, matching_vault["vault_id"], matching_vault)
         
-        await manager.broadcast({
+        invalidate_response_cache()
+        manager.broadcast({
             "type": "vault_unlocked",
             "data": {"status": "Vault unlocked successfully"}
         })
@@ -471,24 +1039,14 @@ async def lock_vault():
             if auth_manager and len(auth_manager.accounts) > 0:
                 try:
                     encrypted_accounts = auth_manager.save_accounts_to_vault()
-                    accounts_file = get_accounts_file_path(vault_id)
-                    with open(accounts_file, 'w') as f:
-                        json.dump(encrypted_accounts, f)
+                    await persist_accounts(vault_id, encrypted_accounts)
                     print(f"Accounts saved for vault {vault_id}")
                 except Exception as e:
                     print(f"Could not save accounts: {e}")
             
-            # Save file registry for this vault
-            storage_manager = app_state.get("storage_manager")
-            if storage_manager and len(storage_manager.stored_files) > 0:
-                try:
-                    encrypted_registry = storage_manager.save_file_registry()
-                    registry_file = get_registry_file_path(vault_id)
-                    with open(registry_file, 'w') as f:
-                        json.dump(encrypted_registry, f)
-                    print(f"File registry saved for vault {vault_id}")
-                except Exception as e:
-                    print(f"Could not save file registry: {e}")
+            # Save file registry for this vault, folding in the journal
+            await run_in_threadpool(save_file_registry_to_disk)
+            await run_in_threadpool(close_registry_journal)
         
         # Lock vault
         vault.lock_vault()
@@ -499,7 +1057,8 @@ async def lock_vault():
         app_state["storage_manager"] = None
         app_state["vault_unlocked"] = False
         
-        await manager.broadcast({
+        invalidate_response_cache()
+        manager.broadcast({
             "type": "vault_locked",
             "data": {"status": "Vault locked"}
         })
@@ -510,10 +1069,14 @@ async def lock_vault():
         raise HTTPException(status_code=500, detail=f"Failed to lock vault: {str(e)}")
 
 @app.get("/vault/list")
-async def list_vaults():
+async def list_vaults(request: Request):
     """List all registered vaults (for debugging/admin)"""
     try:
-        vaults = list_vaults_from_registry()
+        cached = get_cached_response("vault_list")
+        if cached:
+            return etag_response(request, *cached)
+        
+        vaults = await run_in_threadpool(list_vaults_from_registry)
         
         # Remove sensitive data from response
         safe_vaults = []
@@ -526,11 +1089,12 @@ async def list_vaults():
                 "has_verification": "verification_data" in vault
             })
         
-        return {
+        etag, body = cache_response("vault_list", {
             "success": True,
             "vaults": safe_vaults,
             "total_vaults": len(safe_vaults)
-        }
+        })
+        return etag_response(request, etag, body)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list vaults: {str(e)}")
@@ -571,10 +1135,10 @@ async def setup_oauth(credentials_file: str = "credentials.json"):
     
     try:
         auth_manager = app_state["auth_manager"]
-        if not os.path.exists(credentials_file):
+        if not await file_exists(credentials_file):
             raise HTTPException(status_code=404, detail=f"Credentials file not found: {credentials_file}")
         
-        auth_manager.setup_oauth_from_file(credentials_file)
+        await run_in_threadpool(auth_manager.setup_oauth_from_file, credentials_file)
         
         return {
             "success": True,
@@ -598,24 +1162,20 @@ async def authenticate_account(request: AccountAuthRequest):
         
         # Setup OAuth if not already done
         if not auth_manager.client_config:
-            auth_manager.setup_oauth_from_file(request.credentials_file)
+            await run_in_threadpool(auth_manager.setup_oauth_from_file, request.credentials_file)
         
-        # Authenticate account
-        account_id = auth_manager.authenticate_new_account(request.account_name)
+        # Authenticate account (waits on the browser OAuth flow, so it must stay off the event loop)
+        account_id = await run_in_threadpool(auth_manager.authenticate_new_account, request.account_name)
         
         # Save accounts to vault-specific file
-        if vault and vault.vault_id:
-            encrypted_accounts = auth_manager.save_accounts_to_vault()
-            accounts_file = get_accounts_file_path(vault.vault_id)
-            with open(accounts_file, 'w') as f:
-                json.dump(encrypted_accounts, f)
+        schedule_accounts_save()
         
         # TRIGGER AUTO-DISCOVERY for new account
         discovered = 0
         if storage_manager:
             print(f"Triggering file discovery for new account: {account_id}")
             old_count = len(storage_manager.stored_files)
-            storage_manager.refresh_file_discovery()
+            await run_in_threadpool(storage_manager.refresh_file_discovery)
             new_count = len(storage_manager.stored_files)
             discovered = new_count - old_count
             
@@ -623,10 +1183,10 @@ async def authenticate_account(request: AccountAuthRequest):
                 print(f"Discovered {discovered} existing files in new account!")
         
         # Get account info
-        accounts = auth_manager.list_accounts()
-        new_account = next((acc for acc in accounts if acc['account_id'] == account_id), None)
+        new_account = await run_in_threadpool(auth_manager.get_account_info, account_id)
         
-        await manager.broadcast({
+        invalidate_response_cache()
+        manager.broadcast({
             "type": "account_added",
             "data": {
                 "account": new_account,
@@ -646,33 +1206,39 @@ async def authenticate_account(request: AccountAuthRequest):
         raise HTTPException(status_code=500, detail=f"Failed to authenticate account: {str(e)}")
 
 @app.get("/accounts/list")
-async def list_accounts():
+async def list_accounts(request: Request):
     """List all configured Google accounts"""
     if not app_state["vault_unlocked"]:
         raise HTTPException(status_code=401, detail="Vault must be unlocked first")
     
     try:
-        auth_manager = app_state["auth_manager"]
-        accounts = auth_manager.list_accounts()
+        cached = get_cached_response("accounts_list")
+        if cached:
+            return etag_response(request, *cached)
+        
+        storage_manager = app_state["storage_manager"]
         
-        # Get storage info for each account
-        if app_state["storage_manager"]:
-            available_accounts = app_state["storage_manager"].get_available_accounts()
+        # Account listing and Drive storage info are both network-bound; fetch them together
+        if storage_manager:
+            accounts, available_accounts = await asyncio.gather(
+                get_accounts_snapshot(),
+                run_in_threadpool(storage_manager.get_available_accounts)
+            )
             
             # Merge storage info with account info
+            available_by_id = index_by(available_accounts, 'account_id')
             for account in accounts:
-                storage_info = next(
-                    (acc for acc in available_accounts if acc['account_id'] == account['account_id']), 
-                    None
-                )
-                if storage_info:
-                    account['storage_info'] = storage_info['storage_info']
+                if account['account_id'] in available_by_id:
+                    account['storage_info'] = available_by_id[account['account_id']]['storage_info']
+        else:
+            accounts = await get_accounts_snapshot()
         
-        return {
+        etag, body = cache_response("accounts_list", {
             "success": True,
             "accounts": accounts,
             "total_accounts": len(accounts)
-        }
+        })
+        return etag_response(request, etag, body)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list accounts: {str(e)}")
@@ -685,7 +1251,7 @@ async def test_account(account_id: str):
     
     try:
         auth_manager = app_state["auth_manager"]
-        test_result = auth_manager.test_account_access(account_id)
+        test_result = await run_in_threadpool(auth_manager.test_account_access, account_id)
         
         return {
             "success": test_result["success"],
@@ -697,109 +1263,114 @@ async def test_account(account_id: str):
 
 # Storage Information Endpoints
 
-@app.get("/storage/info", response_model=StorageInfo)
-async def get_storage_info():
+@app.get("/storage/info")
+async def get_storage_info(request: Request):
     """Get comprehensive storage information with workspace account handling"""
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
+        cached = get_cached_response("storage_info")
+        if cached:
+            return etag_response(request, *cached)
         
         # Get account information with smart workspace detection
-        auth_manager = app_state["auth_manager"]
-        accounts = auth_manager.list_accounts()
-        
-        # Separate personal and workspace accounts
-        personal_accounts = []
-        workspace_accounts = []
-        
-        total_personal_capacity = 0
-        total_personal_used = 0
-        total_workspace_drive_usage = 0
+        accounts = await get_accounts_snapshot()
         
-        for account in accounts:
-            storage_info = account.get('storage_info', {})
-            account_type = storage_info.get('account_type', 'personal')
-            
-            if account_type == 'workspace':
-                workspace_accounts.append(account)
-                total_workspace_drive_usage += storage_info.get('used_gb', 0)
-            else:
-                personal_accounts.append(account)
-                total_personal_capacity += storage_info.get('total_gb', 0)
-                total_personal_used += storage_info.get('used_gb', 0)
-        
-        total_personal_available = total_personal_capacity - total_personal_used
-        
-        # Calculate usage percentage for personal accounts only
-        personal_usage_percentage = (total_personal_used / total_personal_capacity * 100) if total_personal_capacity > 0 else 0
-        
-        return StorageInfo(
-            total_accounts=len(personal_accounts),  # Only count personal accounts
-            total_capacity_gb=total_personal_capacity,
-            total_used_gb=total_personal_used,
-            total_available_gb=total_personal_available,
-            usage_percentage=personal_usage_percentage,
-            accounts=accounts,  # Include all accounts but with type distinction
-            workspace_summary={
-                'count': len(workspace_accounts),
-                'drive_usage_gb': total_workspace_drive_usage,
-                'accounts': workspace_accounts
-            } if workspace_accounts else None
-        )
+        # Plain dict instead of a response model - this endpoint is polled and
+        # has nothing to validate
+        storage_info = summarize_storage(accounts)
+        etag, body = cache_response("storage_info", storage_info)
+        return etag_response(request, etag, body)
         
     except Exception as e:
-        print(f"Storage info error: {e}")
+        logger.warning("Storage info error: %s", e)
         # Return empty storage info for workspace-only setups
-        return StorageInfo(
-            total_accounts=0,
-            total_capacity_gb=0.0,
-            total_used_gb=0.0,
-            total_available_gb=0.0,
-            usage_percentage=0.0,
-            accounts=[],
-            workspace_summary=None
-        )
+        return {
+            "total_accounts": 0,
+            "total_capacity_gb": 0.0,
+            "total_used_gb": 0.0,
+            "total_available_gb": 0.0,
+            "usage_percentage": 0.0,
+            "accounts": [],
+            "workspace_summary": None
+        }
+
+def summarize_storage(accounts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Total up personal account capacity in one pass; workspace accounts are reported separately"""
+    personal_accounts = []
+    workspace_accounts = []
+    capacity = used = workspace_used = 0.0
+    
+    for account in accounts:
+        storage_info = account.get('storage_info') or {}
+        if storage_info.get('account_type', 'personal') == 'workspace':
+            workspace_accounts.append(account)
+            workspace_used += storage_info.get('used_gb', 0)
+        else:
+            personal_accounts.append(account)
+            capacity += storage_info.get('total_gb', 0)
+            used += storage_info.get('used_gb', 0)
+    
+    # Usage percentage covers personal accounts only
+    usage_percentage = (used / capacity * 100) if capacity > 0 else 0
+    
+    return {
+        "total_accounts": len(personal_accounts),  # Only count personal accounts
+        "total_capacity_gb": round(capacity, 2),
+        "total_used_gb": round(used, 2),
+        "total_available_gb": round(capacity - used, 2),
+        "usage_percentage": round(usage_percentage, 2),
+        "accounts": accounts,  # Include all accounts but with type distinction
+        "workspace_summary": {
+            'count': len(workspace_accounts),
+            'drive_usage_gb': round(workspace_used, 2),
+            'accounts': workspace_accounts
+        } if workspace_accounts else None
+    }
 
 # File Management Endpoints - UPDATED FOR UNIFIED EXPERIENCE
 
-@app.post("/files/upload", response_model=FileUploadResponse)
+# FileUploadResponse only documents the response; the handler returns a plain dict
+@app.post("/files/upload", responses={200: {"model": FileUploadResponse}})
 async def upload_file(file: UploadFile = File(...), metadata: str = "{}"):
     """Upload and encrypt a file"""
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
-        
         # Parse metadata
-        file_metadata = json.loads(metadata) if metadata else {}
+        file_metadata = orjson.loads(metadata) if metadata else {}
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file.filename}") as temp_file:
-            shutil.copyfileobj(file.file, temp_file)
-            temp_file_path = temp_file.name
+        # Small uploads are encrypted straight from memory. Larger ones are
+        # spilled to a pooled temp file in a single threadpool call so the
+        # event loop is never blocked on disk I/O.
+        head = await file.read(SMALL_UPLOAD_LIMIT + 1)
+        spill_path = None
         
         try:
-            # Store file using BrontoBox
-            file_id = storage_manager.store_file(temp_file_path, file_metadata)
+            if len(head) <= SMALL_UPLOAD_LIMIT:
+                file_id = await run_in_threadpool(
+                    storage_manager.store_bytes, head, file.filename or "upload", file_metadata
+                )
+            else:
+                spill_path = acquire_spill_file()
+                await run_in_threadpool(spill_upload, file.file, spill_path, head)
+                
+                # Store file using BrontoBox
+                file_id = await run_in_threadpool(
+                    storage_manager.store_file, spill_path, file_metadata, file.filename or "upload"
+                )
             
             # Get file info
-            files = storage_manager.list_stored_files()
-            stored_file = next((f for f in files if f['file_id'] == file_id), None)
+            stored_file = storage_manager.get_file_info(file_id)
             
             if not stored_file:
                 raise HTTPException(status_code=500, detail="File stored but not found in registry")
             
             # Auto-save registry after successful upload
-            save_file_registry_to_disk()
+            await run_in_threadpool(record_registry_change, file_id)
             
-            await manager.broadcast({
+            invalidate_response_cache()
+            manager.broadcast({
                 "type": "file_uploaded",
                 "data": {
                     "file_id": file_id,
@@ -808,28 +1379,29 @@ async def upload_file(file: UploadFile = File(...), metadata: str = "{}"):
                 }
             })
             
-            return FileUploadResponse(
-                file_id=file_id,
-                filename=file.filename,
-                size=stored_file["size_bytes"],
-                chunks=stored_file["chunks"],
-                accounts_used=stored_file["accounts_used"],
-                upload_time=stored_file["created_at"]
-            )
+            return {
+                "file_id": file_id,
+                "filename": file.filename,
+                "size": stored_file["size_bytes"],
+                "chunks": stored_file["chunks"],
+                "accounts_used": stored_file["accounts_used"],
+                "upload_time": stored_file["created_at"]
+            }
             
         finally:
-            # Clean up temp file
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
+            # Return the spill file to the pool
+            if spill_path:
+                await run_in_threadpool(release_spill_file, spill_path)
                 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
 
 @app.get("/files/list")
-async def list_files():
+async def list_files(request: Request, limit: Optional[int] = None, cursor: Optional[str] = None):
     """
     ENHANCED: List all BrontoBox files (auto-discovered + uploaded)
     Now shows unified view across all accounts with original filenames
+    Pass limit (and then next_cursor) to page through the list instead
     """
     if not app_state["vault_unlocked"]:
         raise HTTPException(status_code=401, detail="Vault must be unlocked first")
@@ -844,17 +1416,44 @@ async def list_files():
                 "message": "Storage manager not initialized"
             }
         
+        # Paged listing: only the requested slice is serialized
+        if limit is not None or cursor is not None:
+            limit = max(1, min(limit or FILES_PAGE_SIZE, MAX_FILES_PAGE_SIZE))
+            after_id = decode_cursor(cursor).get("after_id") if cursor else None
+            try:
+                files, next_after_id = storage_manager.list_stored_files_page(limit, after_id)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Cursor no longer valid - restart the listing")
+            
+            return BrontoBoxJSONResponse({
+                "success": True,
+                "files": files,
+                "total_files": len(storage_manager.stored_files),
+                "next_cursor": encode_cursor({"after_id": next_after_id}) if next_after_id else None
+            })
+        
+        # The full listing only changes with the registry version, so its
+        # serialized body and ETag are reused until then
+        cache_key = f"files_list:{id(storage_manager)}:{storage_manager.files_version}"
+        cached = get_cached_response(cache_key)
+        if cached:
+            return etag_response(request, *cached)
+        
         # Get unified BrontoBox files (includes auto-discovered ones)
         files = storage_manager.get_unified_brontobox_files()
+        counts = storage_manager.get_file_counts()
         
-        return {
+        etag, body = cache_response(cache_key, {
             "success": True,
             "files": files,
             "total_files": len(files),
-            "auto_discovered": sum(1 for f in files if f.get('is_discovered', False)),
-            "user_uploaded": sum(1 for f in files if not f.get('is_discovered', False))
-        }
+            "auto_discovered": counts['discovered'],
+            "user_uploaded": counts['uploaded']
+        })
+        return etag_response(request, etag, body)
         
+    except HTTPException:
+        raise
     except Exception as e:
         # Return empty list on error instead of failing
         return {
@@ -871,20 +1470,16 @@ async def refresh_file_discovery():
     NEW ENDPOINT: Manually refresh file discovery across all accounts
     Useful when user wants to refresh the file list
     """
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
-        
         # Refresh discovery
         old_count = len(storage_manager.stored_files)
-        storage_manager.refresh_file_discovery()
+        await run_in_threadpool(storage_manager.refresh_file_discovery)
         new_count = len(storage_manager.stored_files)
         
-        await manager.broadcast({
+        invalidate_response_cache()
+        manager.broadcast({
             "type": "files_refreshed",
             "data": {
                 "old_count": old_count,
@@ -905,45 +1500,48 @@ async def refresh_file_discovery():
         raise HTTPException(status_code=500, detail=f"Failed to refresh discovery: {str(e)}")
 
 @app.get("/files/statistics")
-async def get_file_statistics():
+async def get_file_statistics(request: Request):
     """
     NEW ENDPOINT: Get detailed file statistics
     Shows breakdown of discovered vs uploaded files
     """
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
+        # Statistics only change with the registry version
+        cache_key = f"files_statistics:{id(storage_manager)}:{storage_manager.files_version}"
+        cached = get_cached_response(cache_key)
+        if cached:
+            return etag_response(request, *cached)
         
         files = storage_manager.get_unified_brontobox_files()
         
-        # Calculate statistics
+        # Calculate statistics and account distribution in one pass
         total_files = len(files)
-        discovered_files = [f for f in files if f.get('is_discovered', False)]
-        uploaded_files = [f for f in files if not f.get('is_discovered', False)]
-        
-        total_size = sum(f['size_bytes'] for f in files)
-        discovered_size = sum(f['size_bytes'] for f in discovered_files)
-        uploaded_size = sum(f['size_bytes'] for f in uploaded_files)
-        
-        # Account distribution
+        discovered_count = 0
+        discovered_size = uploaded_size = 0
         account_usage = {}
         for file_info in files:
-            for account_id in file_info.get('accounts_used', []):
-                if account_id not in account_usage:
-                    account_usage[account_id] = {'files': 0, 'size_bytes': 0}
-                account_usage[account_id]['files'] += 1
-                account_usage[account_id]['size_bytes'] += file_info['size_bytes']
+            size = file_info['size_bytes']
+            if file_info.get('is_discovered', False):
+                discovered_count += 1
+                discovered_size += size
+            else:
+                uploaded_size += size
+            
+            for account_id in file_info.get('accounts_used', ()):
+                usage = account_usage.setdefault(account_id, {'files': 0, 'size_bytes': 0})
+                usage['files'] += 1
+                usage['size_bytes'] += size
         
-        return {
+        total_size = discovered_size + uploaded_size
+        
+        etag, body = cache_response(cache_key, {
             "success": True,
             "statistics": {
                 "total_files": total_files,
-                "discovered_files": len(discovered_files),
-                "uploaded_files": len(uploaded_files),
+                "discovered_files": discovered_count,
+                "uploaded_files": total_files - discovered_count,
                 "total_size_bytes": total_size,
                 "total_size_gb": round(total_size / (1024**3), 2),
                 "discovered_size_bytes": discovered_size,
@@ -952,8 +1550,11 @@ async def get_file_statistics():
                 "accounts_used": len(account_usage)
             },
             "message": f"Found {total_files} BrontoBox files across {len(account_usage)} accounts"
-        }
+        })
+        return etag_response(request, etag, body)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get statistics: {str(e)}")
 
@@ -963,37 +1564,30 @@ async def download_file(file_id: str):
     ENHANCED: Download original decrypted file
     Now works for both uploaded and auto-discovered files
     """
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
-        
         # Get file info
-        files = storage_manager.list_stored_files()
-        file_info = next((f for f in files if f['file_id'] == file_id), None)
+        file_info = storage_manager.get_file_info(file_id)
         
         if not file_info:
             raise HTTPException(status_code=404, detail="File not found")
         
-        # Create temp file for download
-        temp_dir = tempfile.mkdtemp()
-        output_path = os.path.join(temp_dir, file_info['name'])
-        
-        # Retrieve file (handles both regular and discovered files)
-        success = storage_manager.retrieve_file(file_id, output_path)
-        
-        if not success:
-            shutil.rmtree(temp_dir)
+        # Stream the decrypted file straight to the client (handles both regular
+        # and discovered files). The first chunk is fetched up front so failures
+        # still surface as an error response rather than a truncated download.
+        try:
+            content = await run_in_threadpool(storage_manager.iter_file_content, file_id)
+            first_chunk = await run_in_threadpool(next, content, b"")
+        except Exception as e:
+            logger.warning("Failed to retrieve file %s: %s", file_id, e)
             raise HTTPException(status_code=500, detail="Failed to retrieve file")
         
         # Special handling for discovered files
         if file_info.get('is_discovered'):
-            print(f"Downloaded discovered file - may need manual verification")
+            logger.info("Downloaded discovered file - may need manual verification")
         
-        await manager.broadcast({
+        manager.broadcast({
             "type": "file_downloaded",
             "data": {
                 "file_id": file_id,
@@ -1002,10 +1596,16 @@ async def download_file(file_id: str):
             }
         })
         
-        return FileResponse(
-            path=output_path,
-            filename=file_info['name'],
-            media_type='application/octet-stream'
+        headers = {"Content-Disposition": content_disposition(file_info['name'])}
+        # Sizes of discovered files are estimates, so only advertise a length
+        # for files whose manifest guarantees it
+        if not file_info.get('is_discovered'):
+            headers["Content-Length"] = str(file_info['size_bytes'])
+        
+        return StreamingResponse(
+            itertools.chain([first_chunk], content),
+            media_type='application/octet-stream',
+            headers=headers
         )
         
     except HTTPException:
@@ -1016,31 +1616,26 @@ async def download_file(file_id: str):
 @app.delete("/files/{file_id}")
 async def delete_file(file_id: str):
     """Delete a file"""
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
-        
         # Get file info before deletion
-        files = storage_manager.list_stored_files()
-        file_info = next((f for f in files if f['file_id'] == file_id), None)
+        file_info = storage_manager.get_file_info(file_id)
         
         if not file_info:
             raise HTTPException(status_code=404, detail="File not found")
         
         # Delete file
-        success = storage_manager.delete_file(file_id)
+        success = await run_in_threadpool(storage_manager.delete_file, file_id)
         
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete file")
         
         # Auto-save registry after successful deletion
-        save_file_registry_to_disk()
+        await run_in_threadpool(record_registry_change, file_id)
         
-        await manager.broadcast({
+        invalidate_response_cache()
+        manager.broadcast({
             "type": "file_deleted",
             "data": {
                 "file_id": file_id,
@@ -1061,22 +1656,24 @@ async def delete_file(file_id: str):
 # Updated Drive Management Endpoints - NOW SHOWS BRONTOBOX FILES
 
 @app.get("/drive/brontobox-files/{account_id}")
-async def list_brontobox_files_for_account(account_id: str):
+async def list_brontobox_files_for_account(account_id: str, request: Request):
     """
     ENHANCED: List BrontoBox files for specific account
     Shows original filenames, not encrypted chunk names
     """
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
+        cache_key = f"account_files:{account_id}:{id(storage_manager)}:{storage_manager.files_version}"
+        cached = get_cached_response(cache_key)
+        if cached:
+            return etag_response(request, *cached)
         
         # Get all BrontoBox files
         all_files = storage_manager.get_unified_brontobox_files()
         
+        chunk_counts = storage_manager.get_account_chunk_counts(account_id)
+        
         # Filter files that use this account
         account_files = []
         for file_info in all_files:
@@ -1085,52 +1682,57 @@ async def list_brontobox_files_for_account(account_id: str):
                 # Add account-specific info
                 file_copy = file_info.copy()
                 file_copy['account_id'] = account_id
-                file_copy['chunks_in_account'] = sum(
-                    1 for chunk in storage_manager.stored_files[file_info['file_id']].chunks
-                    if chunk['drive_account'] == account_id
-                )
+                file_copy['chunks_in_account'] = chunk_counts.get(file_info['file_id'], 0)
                 account_files.append(file_copy)
         
-        return {
+        etag, body = cache_response(cache_key, {
             "success": True,
             "account_id": account_id,
             "files": account_files,
             "total_files": len(account_files),
             "view_type": "brontobox_files"
-        }
+        })
+        return etag_response(request, etag, body)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list BrontoBox files: {str(e)}")
 
 @app.get("/drive/raw-chunks/{account_id}")
-async def list_raw_chunks(account_id: str):
+async def list_raw_chunks(account_id: str, limit: Optional[int] = None, cursor: Optional[str] = None):
     """
     TECHNICAL VIEW: List raw encrypted chunks (for advanced users)
     This shows the actual encrypted files stored in Google Drive
+    Pass limit to page through large accounts, and next_cursor back for the next page
     """
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
-        
         drive_client = storage_manager.drive_client
         
-        # List raw chunks
-        chunks = drive_client.list_chunks(account_id=account_id)
+        # List raw chunks, one Drive page at a time
+        page_token = decode_cursor(cursor).get("page_token") if cursor else None
+        chunks, next_page_token = await run_in_threadpool(
+            drive_client.list_chunks_page,
+            account_id=account_id,
+            limit=limit,
+            page_token=page_token
+        )
         chunks_data = [chunk.to_dict() for chunk in chunks]
         
-        return {
+        return BrontoBoxJSONResponse({
             "success": True,
             "account_id": account_id,
             "chunks": chunks_data,
             "total_chunks": len(chunks_data),
             "view_type": "raw_chunks",
-            "warning": "These are encrypted chunks - use BrontoBox files view for normal operation"
-        }
+            "warning": "These are encrypted chunks - use BrontoBox files view for normal operation",
+            "next_cursor": encode_cursor({"page_token": next_page_token}) if next_page_token else None
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list raw chunks: {str(e)}")
 
@@ -1140,39 +1742,41 @@ async def list_drive_chunks(
     sort_by: str = "date", 
     order: str = "desc",
     limit: Optional[int] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    """List chunks in Google Drive with sorting and filtering"""
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    """List chunks in Google Drive with sorting and filtering; pass next_cursor back to page"""
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
-        
         drive_client = storage_manager.drive_client
         
         # List chunks with parameters
-        chunks = drive_client.list_chunks(
+        page_token = decode_cursor(cursor).get("page_token") if cursor else None
+        chunks, next_page_token = await run_in_threadpool(
+            drive_client.list_chunks_page,
             account_id=account_id,
             sort_by=sort_by,
             search_query=search,
-            limit=limit
+            limit=limit,
+            page_token=page_token
         )
         
         # Convert to dict format
         chunks_data = [chunk.to_dict() for chunk in chunks]
         
-        return {
+        return BrontoBoxJSONResponse({
             "success": True,
             "account_id": account_id,
             "chunks": chunks_data,
             "total_chunks": len(chunks_data),
             "sort_by": sort_by,
-            "order": order
-        }
+            "order": order,
+            "next_cursor": encode_cursor({"page_token": next_page_token}) if next_page_token else None
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list chunks: {str(e)}")
 
@@ -1183,18 +1787,14 @@ async def search_drive_chunks(
     search_type: str = "all"
 ):
     """Search chunks in Google Drive"""
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
-        
         drive_client = storage_manager.drive_client
         
         # Search chunks
-        chunks = drive_client.search_chunks(
+        chunks = await run_in_threadpool(
+            drive_client.search_chunks,
             account_id=account_id,
             search_term=query,
             search_type=search_type
@@ -1203,76 +1803,69 @@ async def search_drive_chunks(
         # Convert to dict format
         chunks_data = [chunk.to_dict() for chunk in chunks]
         
-        return {
+        return BrontoBoxJSONResponse({
             "success": True,
             "account_id": account_id,
             "query": query,
             "search_type": search_type,
             "chunks": chunks_data,
             "total_results": len(chunks_data)
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to search chunks: {str(e)}")
 
 @app.get("/drive/stats/{account_id}")
-async def get_drive_folder_stats(account_id: str):
+async def get_drive_folder_stats(account_id: str, request: Request):
     """Get statistics about the BrontoBox folder in Google Drive"""
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
+        cache_key = f"drive_stats:{account_id}"
+        cached = get_cached_response(cache_key)
+        if cached:
+            return etag_response(request, *cached)
         
         drive_client = storage_manager.drive_client
         
         # Get folder statistics
-        stats = drive_client.get_folder_stats(account_id)
+        stats = await run_in_threadpool(drive_client.get_folder_stats, account_id)
         
-        return {
+        etag, body = cache_response(cache_key, {
             "success": True,
             "account_id": account_id,
             **stats
-        }
+        })
+        return etag_response(request, etag, body)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get folder stats: {str(e)}")
 
 @app.get("/drive/download/{account_id}/{file_id}")
 async def download_raw_chunk(account_id: str, file_id: str):
     """Download a raw encrypted chunk from Google Drive"""
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
-        
         drive_client = storage_manager.drive_client
         
-        # Download the raw chunk
-        chunk_data = drive_client.download_chunk(account_id, file_id)
-        
-        # Get file metadata for filename
-        chunks = drive_client.list_chunks(account_id)
-        target_chunk = next((c for c in chunks if c.file_id == file_id), None)
-        
-        filename = target_chunk.name if target_chunk else f"chunk_{file_id}.enc"
-        
-        # Create temp file for download
-        temp_dir = tempfile.mkdtemp()
-        temp_path = os.path.join(temp_dir, filename)
-        
-        with open(temp_path, 'wb') as f:
-            f.write(chunk_data)
-        
-        return FileResponse(
-            path=temp_path,
-            filename=filename,
-            media_type='application/octet-stream'
+        # Stream the raw chunk from Drive; the metadata fetched with it carries
+        # the filename and size. The first block is fetched up front so failures
+        # still surface as an error response rather than a truncated download.
+        chunk_metadata, content = await run_in_threadpool(drive_client.iter_download_chunk, account_id, file_id)
+        first_block = await run_in_threadpool(next, content, b"")
+        
+        filename = chunk_metadata.get('name') or f"chunk_{file_id}.enc"
+        headers = {"Content-Disposition": content_disposition(filename)}
+        if 'size' in chunk_metadata:
+            headers["Content-Length"] = str(chunk_metadata['size'])
+        
+        return StreamingResponse(
+            itertools.chain([first_block], content),
+            media_type='application/octet-stream',
+            headers=headers
         )
         
     except Exception as e:
@@ -1281,30 +1874,25 @@ async def download_raw_chunk(account_id: str, file_id: str):
 @app.delete("/drive/delete/{account_id}/{file_id}")
 async def delete_raw_chunk(account_id: str, file_id: str):
     """Delete a raw encrypted chunk from Google Drive"""
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
-        
         drive_client = storage_manager.drive_client
         
         # Get file info before deletion
-        chunks = drive_client.list_chunks(account_id)
-        target_chunk = next((c for c in chunks if c.file_id == file_id), None)
+        target_chunk = await run_in_threadpool(drive_client.get_chunk_metadata, account_id, file_id)
         
         if not target_chunk:
             raise HTTPException(status_code=404, detail="Chunk not found")
         
         # Delete the chunk
-        success = drive_client.delete_chunk(account_id, file_id)
+        success = await run_in_threadpool(drive_client.delete_chunk, account_id, file_id)
         
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete chunk")
         
-        await manager.broadcast({
+        invalidate_response_cache()
+        manager.broadcast({
             "type": "raw_chunk_deleted",
             "data": {
                 "account_id": account_id,
@@ -1325,29 +1913,60 @@ async def delete_raw_chunk(account_id: str, file_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete chunk: {str(e)}")
 
+@app.post("/drive/chunks/{account_id}/delete")
+async def delete_raw_chunks(account_id: str, request: ChunkDeleteRequest):
+    """Delete several raw encrypted chunks from Google Drive in one batch request"""
+    storage_manager = require_storage_manager()
+    
+    file_ids = [fid for fid in request.file_ids if fid]
+    if not file_ids:
+        raise HTTPException(status_code=400, detail="No chunk IDs given")
+    
+    try:
+        drive_client = storage_manager.drive_client
+        
+        results = await run_in_threadpool(drive_client.delete_chunks, account_id, file_ids)
+        deleted = [fid for fid, ok in results.items() if ok]
+        failed = [fid for fid, ok in results.items() if not ok]
+        
+        if deleted:
+            invalidate_response_cache()
+            manager.broadcast({
+                "type": "raw_chunks_deleted",
+                "data": {
+                    "account_id": account_id,
+                    "file_ids": deleted
+                }
+            })
+        
+        return {
+            "success": not failed,
+            "message": f"Deleted {len(deleted)}/{len(results)} chunks",
+            "account_id": account_id,
+            "deleted": deleted,
+            "failed": failed
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to delete chunks: {str(e)}")
+
 @app.get("/drive/folder-info/{account_id}")
 async def get_brontobox_folder_info(account_id: str):
     """Get information about the .brontobox_storage folder"""
-    if not app_state["vault_unlocked"]:
-        raise HTTPException(status_code=401, detail="Vault must be unlocked first")
+    storage_manager = require_storage_manager()
     
     try:
-        storage_manager = app_state["storage_manager"]
-        if not storage_manager:
-            raise HTTPException(status_code=500, detail="Storage manager not initialized")
-        
         drive_client = storage_manager.drive_client
         
-        # Get basic storage info
-        storage_info = drive_client.get_storage_info(account_id)
-        
-        # Get folder stats
-        folder_stats = drive_client.get_folder_stats(account_id)
+        # Get basic storage info and folder stats concurrently
+        storage_info, folder_stats = await asyncio.gather(
+            run_in_threadpool(drive_client.get_storage_info, account_id),
+            run_in_threadpool(drive_client.get_folder_stats, account_id)
+        )
         
         # Get account info
         auth_manager = app_state["auth_manager"]
-        accounts = auth_manager.list_accounts()
-        account_info = next((acc for acc in accounts if acc['account_id'] == account_id), None)
+        account_info = auth_manager.get_account_info(account_id, with_storage=False)
         
         return {
             "success": True,
@@ -1379,30 +1998,46 @@ async def refresh_account_tokens():
         refreshed_accounts = []
         failed_accounts = []
         
-        for account_id in auth_manager.accounts.keys():
-            try:
-                # Getting credentials automatically refreshes tokens if needed
-                credentials = auth_manager.get_credentials(account_id)
-                if credentials:
-                    refreshed_accounts.append(account_id)
-                else:
-                    failed_accounts.append(account_id)
-            except Exception as e:
-                print(f"Failed to refresh {account_id}: {e}")
+        # Tokens known to stay valid for a while need no decrypt or round trip
+        fresh_accounts = []
+        account_ids = []
+        for account_id in list(auth_manager.accounts):
+            if auth_manager.needs_token_refresh(account_id):
+                account_ids.append(account_id)
+            else:
+                fresh_accounts.append(account_id)
+        refreshed_accounts.extend(fresh_accounts)
+        stored_before = {account_id: auth_manager.accounts[account_id].credentials_encrypted
+                         for account_id in account_ids}
+        
+        # Refreshes are independent network round trips, so run them all at once
+        # (getting credentials automatically refreshes tokens if needed)
+        results = await asyncio.gather(
+            *(refresh_credentials(auth_manager, account_id) for account_id in account_ids),
+            return_exceptions=True
+        )
+        
+        for account_id, result in zip(account_ids, results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to refresh %s: %s", account_id, result)
+                failed_accounts.append(account_id)
+            elif result:
+                refreshed_accounts.append(account_id)
+            else:
                 failed_accounts.append(account_id)
         
-        # Save updated accounts to vault-specific file
-        if refreshed_accounts and vault and vault.vault_id:
-            encrypted_accounts = auth_manager.save_accounts_to_vault()
-            accounts_file = get_accounts_file_path(vault.vault_id)
-            with open(accounts_file, 'w') as f:
-                json.dump(encrypted_accounts, f)
+        # Save updated accounts to vault-specific file, if any token actually changed
+        if any(account_id in auth_manager.accounts
+               and auth_manager.accounts[account_id].credentials_encrypted is not stored
+               for account_id, stored in stored_before.items()):
+            schedule_accounts_save()
         
         return {
             "success": True,
             "message": "Token refresh completed",
             "refreshed_accounts": len(refreshed_accounts),
             "failed_accounts": len(failed_accounts),
+            "already_fresh": len(fresh_accounts),
             "total_accounts": len(auth_manager.accounts)
         }
         
@@ -1416,9 +2051,10 @@ async def get_account_persistence_status():
         vault = app_state.get("vault")
         vault_id = vault.vault_id if vault else None
         
-        vault_registry_exists = os.path.exists(get_vault_registry_path())
-        accounts_file_exists = os.path.exists(get_accounts_file_path(vault_id)) if vault_id else False
-        registry_file_exists = os.path.exists(get_registry_file_path(vault_id)) if vault_id else False
+        persisted_files = list_persisted_files()
+        vault_registry_exists = get_vault_registry_path() in persisted_files
+        accounts_file_exists = get_accounts_file_path(vault_id) in persisted_files if vault_id else False
+        registry_file_exists = get_registry_file_path(vault_id) in persisted_files if vault_id else False
         
         vault_unlocked = app_state["vault_unlocked"]
         accounts_loaded = len(app_state["auth_manager"].accounts) if app_state["auth_manager"] else 0
@@ -1455,7 +2091,7 @@ async def save_file_registry():
         raise HTTPException(status_code=401, detail="Vault must be unlocked first")
     
     try:
-        success = save_file_registry_to_disk()
+        success = await run_in_threadpool(save_file_registry_to_disk)
         
         if success:
             storage_manager = app_state["storage_manager"]
@@ -1483,7 +2119,7 @@ async def load_file_registry():
         raise HTTPException(status_code=401, detail="Vault must be unlocked first")
     
     try:
-        success = load_file_registry_from_disk()
+        success = await run_in_threadpool(load_file_registry_from_disk)
         
         if success:
             storage_manager = app_state["storage_manager"]
@@ -1522,32 +2158,23 @@ async def export_file_registry():
         if not storage_manager or not vault:
             raise HTTPException(status_code=500, detail="Storage manager or vault not initialized")
         
-        # Get encrypted registry
-        encrypted_registry = storage_manager.save_file_registry()
+        # Get encrypted registry (serializing and encrypting every entry, so off the event loop)
+        encrypted_registry = await run_in_threadpool(storage_manager.save_file_registry)
         
-        # Create export data with metadata
+        # Create export data with metadata (one clock read for the timestamp and filename)
+        now = datetime.now()
         export_data = {
             "export_type": "brontobox_file_registry",
             "vault_id": vault.vault_id,
-            "exported_at": datetime.now().isoformat(),
+            "exported_at": now.isoformat(),
             "brontobox_version": "1.0.0",
             "total_files": len(storage_manager.stored_files),
             "encrypted_registry": encrypted_registry
         }
         
-        # Create temporary file for download
-        temp_dir = tempfile.mkdtemp()
-        filename = f"brontobox_file_registry_{vault.vault_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        file_path = os.path.join(temp_dir, filename)
-        
-        with open(file_path, 'w') as f:
-            json.dump(export_data, f, indent=2)
+        filename = f"brontobox_file_registry_{vault.vault_id}_{now:%Y%m%d_%H%M%S}.json"
         
-        return FileResponse(
-            path=file_path,
-            filename=filename,
-            media_type='application/json'
-        )
+        return json_attachment(export_data, filename)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to export registry: {str(e)}")
@@ -1567,12 +2194,13 @@ async def backup_vault_info():
             raise HTTPException(status_code=500, detail="Vault not initialized")
         
         # Load vault from registry
-        vault_info = load_vault_from_registry(vault.vault_id)
+        vault_info = await run_in_threadpool(load_vault_from_registry, vault.vault_id)
         
         if not vault_info:
             raise HTTPException(status_code=404, detail="Vault information not found")
         
         # Create backup data (SAFE - no private keys)
+        now = datetime.now()
         backup_data = {
             "backup_type": "brontobox_vault_info",
             "vault_id": vault.vault_id,
@@ -1580,25 +2208,15 @@ async def backup_vault_info():
             "verification_data": vault_info["verification_data"],
             "created_at": vault_info.get("created_at"),
             "version": vault_info.get("version", "1.0"),
-            "exported_at": datetime.now().isoformat(),
+            "exported_at": now.isoformat(),
             "brontobox_version": "1.0.0",
             "instructions": "Keep this file safe! You need the salt and your master password to unlock your vault.",
             "warning": "This file does NOT contain your master password or private keys."
         }
         
-        # Create temporary file for download
-        temp_dir = tempfile.mkdtemp()
-        filename = f"brontobox_vault_backup_{vault.vault_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        file_path = os.path.join(temp_dir, filename)
-        
-        with open(file_path, 'w') as f:
-            json.dump(backup_data, f, indent=2)
+        filename = f"brontobox_vault_backup_{vault.vault_id}_{now:%Y%m%d_%H%M%S}.json"
         
-        return FileResponse(
-            path=file_path,
-            filename=filename,
-            media_type='application/json'
-        )
+        return json_attachment(backup_data, filename)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to backup vault info: {str(e)}")
@@ -1631,18 +2249,20 @@ async def clear_all_data():
         # Step 1: Delete all files from Google Drive
         print(f"Starting complete data deletion for vault {vault_id}")
         
-        for file_id, stored_file in storage_manager.stored_files.items():
-            try:
-                print(f"Deleting file: {stored_file.original_name}")
-                success = storage_manager.delete_file(file_id)
-                if success:
-                    deletion_results["files_deleted"] += 1
-                else:
-                    deletion_results["files_failed"] += 1
-                    deletion_results["errors"].append(f"Failed to delete file: {stored_file.original_name}")
-            except Exception as e:
+        # All chunks go out as per-account batch deletes in one pass rather than file by file
+        files_to_delete = dict(storage_manager.stored_files)
+        try:
+            outcome = await run_in_threadpool(storage_manager.delete_files, list(files_to_delete))
+        except Exception as e:
+            outcome = {}
+            deletion_results["errors"].append(f"Error deleting files: {str(e)}")
+        
+        for file_id, stored_file in files_to_delete.items():
+            if outcome.get(file_id):
+                deletion_results["files_deleted"] += 1
+            else:
                 deletion_results["files_failed"] += 1
-                deletion_results["errors"].append(f"Error deleting {stored_file.original_name}: {str(e)}")
+                deletion_results["errors"].append(f"Failed to delete file: {stored_file.original_name}")
         
         # Step 2: Clear account data
         auth_manager = app_state["auth_manager"]
@@ -1655,31 +2275,22 @@ async def clear_all_data():
             accounts_file = get_accounts_file_path(vault_id)
             registry_file = get_registry_file_path(vault_id)
             
-            if os.path.exists(accounts_file):
-                os.remove(accounts_file)
+            if await remove_file(accounts_file):
                 print(f"Removed accounts file: {accounts_file}")
             
-            if os.path.exists(registry_file):
-                os.remove(registry_file)
+            if await remove_file(registry_file):
                 print(f"Removed registry file: {registry_file}")
+            
+            await run_in_threadpool(close_registry_journal)
+            await remove_file(get_registry_journal_path(vault_id))
                 
         except Exception as e:
             deletion_results["errors"].append(f"Error removing vault files: {str(e)}")
         
         # Step 4: Remove vault from registry
         try:
-            registry_path = get_vault_registry_path()
-            if os.path.exists(registry_path):
-                with open(registry_path, 'r') as f:
-                    registry = json.load(f)
-                
-                if vault_id in registry.get("vaults", {}):
-                    del registry["vaults"][vault_id]
-                    
-                    with open(registry_path, 'w') as f:
-                        json.dump(registry, f, indent=2)
-                    
-                    print(f"Removed vault {vault_id} from registry")
+            if await run_in_threadpool(remove_vault_from_registry, vault_id):
+                print(f"Removed vault {vault_id} from registry")
                     
         except Exception as e:
             deletion_results["errors"].append(f"Error updating vault registry: {str(e)}")
@@ -1693,7 +2304,8 @@ async def clear_all_data():
         
         print(f"Data deletion complete: {deletion_results['files_deleted']} files deleted, {deletion_results['accounts_cleared']} accounts cleared")
         
-        await manager.broadcast({
+        invalidate_response_cache()
+        manager.broadcast({
             "type": "data_cleared",
             "data": deletion_results
         })
@@ -1726,7 +2338,7 @@ async def import_file_registry(file: UploadFile = File(...)):
         
         # Read uploaded file
         content = await file.read()
-        import_data = json.loads(content.decode('utf-8'))
+        import_data = orjson.loads(content)
         
         # Validate import data
         if import_data.get("export_type") != "brontobox_file_registry":
@@ -1741,13 +2353,13 @@ async def import_file_registry(file: UploadFile = File(...)):
         
         # Load the encrypted registry
         encrypted_registry = import_data["encrypted_registry"]
-        success = storage_manager.load_file_registry(encrypted_registry)
+        success = await run_in_threadpool(storage_manager.load_file_registry, encrypted_registry)
         
         if success:
             files_imported = len(storage_manager.stored_files)
             
             # Auto-save the imported registry
-            save_file_registry_to_disk()
+            await run_in_threadpool(save_file_registry_to_disk)
             
             return {
                 "success": True,
@@ -1759,7 +2371,7 @@ async def import_file_registry(file: UploadFile = File(...)):
         else:
             raise HTTPException(status_code=400, detail="Failed to decrypt imported registry - may be from incompatible vault")
         
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON file")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to import registry: {str(e)}")
@@ -1857,8 +2469,7 @@ async def detect_backup_files():
             
             if is_vault_backup:
                 try:
-                    with open(filename, 'r') as f:
-                        backup_data = json.load(f)
+                    backup_data = read_json_file(filename)
                     
                     if backup_data.get("backup_type") == "brontobox_vault_info":
                         detected_backups["vault_backups"].append({
@@ -1876,8 +2487,7 @@ async def detect_backup_files():
             
             elif is_registry_backup:
                 try:
-                    with open(filename, 'r') as f:
-                        registry_data = json.load(f)
+                    registry_data = read_json_file(filename)
                     
                     if registry_data.get("export_type") == "brontobox_file_registry":
                         detected_backups["registry_backups"].append({
@@ -1918,12 +2528,11 @@ async def restore_vault_from_backup(backup_file: str, master_password: str):
     """
     try:
         # Read backup file
-        if not os.path.exists(backup_file):
+        try:
+            backup_data = read_json_file(backup_file)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Backup file not found")
         
-        with open(backup_file, 'r') as f:
-            backup_data = json.load(f)
-        
         # Validate backup file
         if backup_data.get("backup_type") != "brontobox_vault_info":
             raise HTTPException(status_code=400, detail="Invalid backup file format")
@@ -1938,14 +2547,14 @@ async def restore_vault_from_backup(backup_file: str, master_password: str):
         vault = VaultCore()
         
         # Try to unlock with provided password and backed up salt/verification
-        success = vault.unlock_vault(master_password, salt, verification_data)
+        success = await run_in_threadpool(vault.unlock_vault, master_password, salt, verification_data)
         
         if not success:
             raise HTTPException(status_code=401, detail="Invalid master password for this vault backup")
         
         # Initialize auth manager and storage manager
         auth_manager = GoogleAuthManager(vault)
-        storage_manager = BrontoBoxStorageManager(vault, auth_manager)
+        storage_manager = await run_in_threadpool(BrontoBoxStorageManager, vault, auth_manager)
         
         # Store in global state
         app_state["vault"] = vault
@@ -1962,11 +2571,12 @@ async def restore_vault_from_backup(backup_file: str, master_password: str):
             "version": backup_data.get("version", "1.0")
         }
         
-        save_vault_to_registry(vault_id, vault_data)
+        await run_in_threadpool(save_vault_to_registry, vault_id, vault_data)
         
         print(f"Vault restored successfully: {vault_id}")
         
-        await manager.broadcast({
+        invalidate_response_cache()
+        manager.broadcast({
             "type": "vault_restored",
             "data": {"vault_id": vault_id, "status": "Vault restored from backup"}
         })
@@ -1995,12 +2605,11 @@ async def import_registry_from_file(registry_file: str):
     
     try:
         # Read registry file
-        if not os.path.exists(registry_file):
+        try:
+            import_data = read_json_file(registry_file)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Registry file not found")
         
-        with open(registry_file, 'r') as f:
-            import_data = json.load(f)
-        
         # Validate registry file
         if import_data.get("export_type") != "brontobox_file_registry":
             raise HTTPException(status_code=400, detail="Invalid registry file format")
@@ -2020,17 +2629,18 @@ async def import_registry_from_file(registry_file: str):
         
         # Load the encrypted registry
         encrypted_registry = import_data["encrypted_registry"]
-        success = storage_manager.load_file_registry(encrypted_registry)
+        success = await run_in_threadpool(storage_manager.load_file_registry, encrypted_registry)
         
         if success:
             files_imported = len(storage_manager.stored_files)
             
             # Auto-save the imported registry to vault-specific file
-            save_file_registry_to_disk()
+            await run_in_threadpool(save_file_registry_to_disk)
             
             print(f"Registry imported: {files_imported} files loaded")
             
-            await manager.broadcast({
+            invalidate_response_cache()
+            manager.broadcast({
                 "type": "registry_imported",
                 "data": {"files_imported": files_imported}
             })
@@ -2068,7 +2678,7 @@ async def analyze_missing_accounts():
         # Get currently connected accounts
         connected_accounts = set()
         if auth_manager:
-            accounts = auth_manager.list_accounts()
+            accounts = await run_in_threadpool(auth_manager.list_accounts)
             connected_accounts = {acc['account_id'] for acc in accounts if acc['is_active']}
         
         # Analyze all files to find required accounts
@@ -2145,8 +2755,7 @@ async def complete_restoration(request: RestoreRequest):
         if not os.path.exists(request.vault_backup_file):
             raise HTTPException(status_code=404, detail="Vault backup file not found")
         
-        with open(request.vault_backup_file, 'r') as f:
-            backup_data = json.load(f)
+        backup_data = read_json_file(request.vault_backup_file)
         
         if backup_data.get("backup_type") != "brontobox_vault_info":
             raise HTTPException(status_code=400, detail="Invalid vault backup file")
@@ -2157,14 +2766,14 @@ async def complete_restoration(request: RestoreRequest):
         
         # Initialize and unlock vault
         vault = VaultCore()
-        success = vault.unlock_vault(request.master_password, salt, verification_data)
+        success = await run_in_threadpool(vault.unlock_vault, request.master_password, salt, verification_data)
         
         if not success:
             raise HTTPException(status_code=401, detail="Invalid master password for vault backup")
         
         # Initialize managers
         auth_manager = GoogleAuthManager(vault)
-        storage_manager = BrontoBoxStorageManager(vault, auth_manager)
+        storage_manager = await run_in_threadpool(BrontoBoxStorageManager, vault, auth_manager)
         
         # Store in global state
         app_state["vault"] = vault
@@ -2180,7 +2789,7 @@ async def complete_restoration(request: RestoreRequest):
             "created_at": backup_data.get("created_at", datetime.now().isoformat()),
             "version": backup_data.get("version", "1.0")
         }
-        save_vault_to_registry(vault_id, vault_data)
+        await run_in_threadpool(save_vault_to_registry, vault_id, vault_data)
         
         print(f"Step 1 complete: Vault {vault_id} restored")
         
@@ -2189,21 +2798,21 @@ async def complete_restoration(request: RestoreRequest):
         if request.registry_backup_file and os.path.exists(request.registry_backup_file):
             print(f"Step 2: Importing registry from {request.registry_backup_file}")
             
-            with open(request.registry_backup_file, 'r') as f:
-                registry_data = json.load(f)
+            registry_data = read_json_file(request.registry_backup_file)
             
             if registry_data.get("export_type") == "brontobox_file_registry":
                 encrypted_registry = registry_data["encrypted_registry"]
-                registry_success = storage_manager.load_file_registry(encrypted_registry)
+                registry_success = await run_in_threadpool(storage_manager.load_file_registry, encrypted_registry)
                 
                 if registry_success:
                     files_imported = len(storage_manager.stored_files)
-                    save_file_registry_to_disk()
+                    await run_in_threadpool(save_file_registry_to_disk)
                     print(f"Step 2 complete: {files_imported} files imported")
                 else:
                     print(f"Step 2 warning: Could not decrypt registry (vault mismatch?)")
         
-        await manager.broadcast({
+        invalidate_response_cache()
+        manager.broadcast({
             "type": "complete_restoration",
             "data": {
                 "vault_id": vault_id,
@@ -2252,8 +2861,7 @@ async def check_backup_compatibility(vault_backup: str, registry_backup: str = N
         # Check vault backup
         if os.path.exists(vault_backup):
             try:
-                with open(vault_backup, 'r') as f:
-                    vault_data = json.load(f)
+                vault_data = read_json_file(vault_backup)
                 
                 if vault_data.get("backup_type") == "brontobox_vault_info":
                     compatibility_info["vault_backup"]["valid"] = True
@@ -2272,8 +2880,7 @@ async def check_backup_compatibility(vault_backup: str, registry_backup: str = N
         # Check registry backup (optional)
         if registry_backup and os.path.exists(registry_backup):
             try:
-                with open(registry_backup, 'r') as f:
-                    registry_data = json.load(f)
+                registry_data = read_json_file(registry_backup)
                 
                 if registry_data.get("export_type") == "brontobox_file_registry":
                     compatibility_info["registry_backup"]["valid"] = True
@@ -2329,16 +2936,18 @@ async def fix_account_mapping():
             raise HTTPException(status_code=500, detail="Managers not initialized")
         
         # Get current accounts
-        current_accounts = auth_manager.list_accounts()
+        current_accounts = await run_in_threadpool(auth_manager.list_accounts)
         current_emails = {acc['email']: acc['account_id'] for acc in current_accounts if acc['is_active']}
         
         print(f"Current accounts: {list(current_emails.keys())}")
         
-        # Get all old account IDs from file metadata
-        old_account_ids = set()
+        # Get all old account IDs from file metadata, with the Drive file IDs
+        # of the chunks each one is expected to hold
+        expected_chunk_ids: Dict[str, set] = {}
         for stored_file in storage_manager.stored_files.values():
             for chunk in stored_file.chunks:
-                old_account_ids.add(chunk['drive_account'])
+                expected_chunk_ids.setdefault(chunk['drive_account'], set()).add(chunk['drive_file_id'])
+        old_account_ids = set(expected_chunk_ids)
         
         print(f"Old account IDs in files: {list(old_account_ids)}")
         
@@ -2346,6 +2955,8 @@ async def fix_account_mapping():
         # Strategy: Check if chunks actually exist in current accounts
         account_mapping = {}
         chunks_remapped = 0
+        # Chunk IDs listed per current account; each account is listed at most once
+        listed_chunk_ids: Dict[str, set] = {}
         
         for old_account_id in old_account_ids:
             best_match = None
@@ -2353,22 +2964,15 @@ async def fix_account_mapping():
             # Try each current account to see if it has chunks for this old account
             for email, current_account_id in current_emails.items():
                 try:
-                    # Try to list chunks in this account to see if it has old data
-                    chunks = storage_manager.drive_client.list_chunks(current_account_id)
+                    # List chunks in this account to see if it has old data
+                    if current_account_id not in listed_chunk_ids:
+                        chunks = await run_in_threadpool(storage_manager.drive_client.list_chunks, current_account_id)
+                        listed_chunk_ids[current_account_id] = {chunk.file_id for chunk in chunks}
                     
                     # Check if any chunks match what we expect from the old account
-                    has_matching_chunks = False
-                    for stored_file in storage_manager.stored_files.values():
-                        for chunk_info in stored_file.chunks:
-                            if chunk_info['drive_account'] == old_account_id:
-                                # Look for this chunk in the current account
-                                drive_file_id = chunk_info['drive_file_id']
-                                matching_chunk = next((c for c in chunks if c.file_id == drive_file_id), None)
-                                if matching_chunk:
-                                    has_matching_chunks = True
-                                    break
-                        if has_matching_chunks:
-                            break
+                    has_matching_chunks = not expected_chunk_ids[old_account_id].isdisjoint(
+                        listed_chunk_ids[current_account_id]
+                    )
                     
                     if has_matching_chunks:
                         best_match = current_account_id
@@ -2401,13 +3005,15 @@ async def fix_account_mapping():
                     for old_id in stored_file.metadata['accounts_used']:
                         new_accounts.append(account_mapping.get(old_id, old_id))
                     stored_file.metadata['accounts_used'] = new_accounts
+            storage_manager.mark_files_changed()
             
             # Save the updated file registry
-            save_file_registry_to_disk()
+            await run_in_threadpool(save_file_registry_to_disk)
             
             print(f"Account mapping complete: {chunks_remapped} chunks remapped")
             
-            await manager.broadcast({
+            invalidate_response_cache()
+            manager.broadcast({
                 "type": "account_mapping_fixed",
                 "data": {"chunks_remapped": chunks_remapped, "mapping": account_mapping}
             })
@@ -2570,8 +3176,7 @@ async def validate_restore_password(request: RestoreRequest):
         if not os.path.exists(request.vault_backup_file):
             raise HTTPException(status_code=404, detail="Vault backup file not found")
         
-        with open(request.vault_backup_file, 'r') as f:
-            backup_data = json.load(f)
+        backup_data = read_json_file(request.vault_backup_file)
         
         if backup_data.get("backup_type") != "brontobox_vault_info":
             raise HTTPException(status_code=400, detail="Invalid vault backup file")
@@ -2584,7 +3189,7 @@ async def validate_restore_password(request: RestoreRequest):
         temp_vault = VaultCore()
         
         # Try to unlock with provided password and backed up salt/verification
-        success = temp_vault.unlock_vault(request.master_password, salt, verification_data)
+        success = await run_in_threadpool(temp_vault.unlock_vault, request.master_password, salt, verification_data)
         
         if not success:
             print(f"Password validation failed for vault {vault_id}")
@@ -2636,7 +3241,7 @@ async def debug_file_info(file_id: str):
                 
                 # Check if account exists
                 auth_manager = app_state["auth_manager"]
-                account_exists = drive_account in [acc['account_id'] for acc in auth_manager.list_accounts()]
+                account_exists = drive_account in auth_manager.accounts
                 
                 chunk_details.append({
                     "chunk_index": chunk_info['chunk_index'],
@@ -2706,7 +3311,7 @@ async def debug_account_comparison():
         auth_manager = app_state["auth_manager"]
         
         # Current accounts
-        current_accounts = auth_manager.list_accounts() if auth_manager else []
+        current_accounts = await run_in_threadpool(auth_manager.list_accounts) if auth_manager else []
         current_account_info = [
             {
                 "account_id": acc['account_id'],
@@ -2761,7 +3366,7 @@ async def debug_account_storage(account_id: str):
         auth_manager = app_state["auth_manager"]
         
         # Get debug storage info
-        debug_info = auth_manager.debug_storage_quota(account_id)
+        debug_info = await run_in_threadpool(auth_manager.debug_storage_quota, account_id)
         
         return {
             "success": True,
@@ -2797,7 +3402,7 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             data = await websocket.receive_text()
             # Echo back for testing
-            await manager.send_personal_message(f"Echo: {data}", websocket)
+            manager.send_personal_message({"type": "echo", "data": f"Echo: {data}"}, websocket)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
@@ -2805,21 +3410,29 @@ async def websocket_endpoint(websocket: WebSocket):
 @app.get("/dev/reset")
 async def reset_app_state():
     """Reset application state (development only)"""
-    # Save registry before reset
-    save_file_registry_to_disk()
+    # Save registry before reset. The state is being dropped anyway, so the save
+    # runs in the background against the objects captured here
+    storage_manager = app_state["storage_manager"]
+    vault = app_state.get("vault")
+    if storage_manager and vault:
+        task = asyncio.create_task(run_in_threadpool(save_file_registry_to_disk, storage_manager, vault))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
     
     app_state["vault"] = None
     app_state["auth_manager"] = None
     app_state["storage_manager"] = None
     app_state["vault_unlocked"] = False
     app_state["active_uploads"] = {}
+    invalidate_response_cache()
     
     return {"success": True, "message": "Application state reset"}
 
 # Error handlers
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
-    return JSONResponse(
+    logger.error("Unhandled error on %s %s", request.method, request.url.path, exc_info=exc)
+    return BrontoBoxJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -2838,10 +3451,43 @@ if __name__ == "__main__":
     print("API Docs: http://localhost:8000/docs")
     print("Health Check: http://localhost:8000/health")
     
+    # uvloop/httptools are picked up when installed (uvloop has no Windows build).
+    # The server stays on a single worker: app_state holds the unlocked vault
+    # keys in-process, so extra workers would each see a locked vault.
+    try:
+        import uvloop  # noqa: F401
+        event_loop = "uvloop"
+    except ImportError:
+        event_loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http_impl = "httptools"
+    except ImportError:
+        http_impl = "h11"
+    print(f"Event loop: {event_loop} / HTTP parser: {http_impl}")
+    
+    # WEB_CONCURRENCY is honoured as a request only; see the note above
+    try:
+        requested_workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        requested_workers = 1
+    if requested_workers > 1:
+        print(f"WEB_CONCURRENCY={requested_workers} ignored: vault state is per-process, running 1 worker")
+    
+    # BRONTOBOX_DEV_RELOAD=1 restarts the server on code changes during development.
+    # The reloader needs the app as an import string and watches the source tree,
+    # so it stays off by default.
+    dev_reload = os.environ.get("BRONTOBOX_DEV_RELOAD", "").lower() in ("1", "true", "yes")
+    if dev_reload:
+        print("Dev reload: ON")
+    
     uvicorn.run(
-        app,
+        "brontobox_api:app" if dev_reload else app,
         host="127.0.0.1",
         port=8000,
-        reload=False,
+        loop=event_loop,
+        http=http_impl,
+        workers=1,
+        reload=dev_reload,
         log_level="info"
     )
\ No newline at end of file
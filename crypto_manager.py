@@ -7,7 +7,7 @@ Handles master password, key derivation, and file encryption/decryption
 import os
 import hashlib
 import secrets
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
@@ -57,7 +57,14 @@ class CryptoManager:
         
         return keys
     
-    def encrypt_data(self, data: bytes, key: bytes) -> Dict[str, Any]:
+    def create_cipher(self, key: bytes) -> AESGCM:
+        """
+        Create an AES-256-GCM cipher backed by OpenSSL (AES-NI when available)
+        Reuse it for every chunk of a file so the key schedule is only expanded once
+        """
+        return AESGCM(key)
+    
+    def encrypt_data(self, data: bytes, key: bytes, cipher: Optional[AESGCM] = None) -> Dict[str, Any]:
         """
         Encrypt data using AES-256-GCM
         Returns dict with encrypted data, nonce, and metadata
@@ -66,7 +73,7 @@ class CryptoManager:
         nonce = secrets.token_bytes(self.nonce_length)
         
         # Create cipher
-        aesgcm = AESGCM(key)
+        aesgcm = cipher or AESGCM(key)
         
         # Encrypt data
         ciphertext = aesgcm.encrypt(nonce, data, None)
@@ -78,7 +85,7 @@ class CryptoManager:
             'key_id': hashlib.sha256(key).hexdigest()[:16]  # Key identifier
         }
     
-    def decrypt_data(self, encrypted_data: Dict[str, Any], key: bytes) -> bytes:
+    def decrypt_data(self, encrypted_data: Dict[str, Any], key: bytes, cipher: Optional[AESGCM] = None) -> bytes:
         """
         Decrypt data using AES-256-GCM
         """
@@ -92,7 +99,7 @@ class CryptoManager:
         nonce = base64.b64decode(encrypted_data['nonce'])
         
         # Create cipher and decrypt
-        aesgcm = AESGCM(key)
+        aesgcm = cipher or AESGCM(key)
         plaintext = aesgcm.decrypt(nonce, ciphertext, None)
         
         return plaintext
@@ -9,7 +9,8 @@ import io
 import json
 import time
 import hashlib
-from typing import Dict, Any, List, Optional, Tuple
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Iterator
 from datetime import datetime, timedelta
 import mimetypes
 
@@ -22,9 +23,19 @@ from google.oauth2.credentials import Credentials
 # BrontoBox imports
 from google_auth import GoogleAuthManager
 
+# BrontoBox folder ID per account; kept at module level so the lookup survives
+# the client being rebuilt on every unlock
+_brontobox_folder_ids: Dict[str, str] = {}
+# Folder IDs already confirmed to exist outside the trash this process
+_verified_folder_ids: set = set()
+
 
 class DriveFile:
     """Represents a file stored in Google Drive with enhanced metadata"""
+    # One is built per listed chunk, so skip the per-instance __dict__
+    __slots__ = ('file_id', 'name', 'size', 'created_time', 'modified_time',
+                 'drive_account', 'mime_type', 'metadata')
+
     def __init__(self, file_id: str, name: str, size: int, 
                  created_time: str, drive_account: str, 
                  modified_time: str = None, mime_type: str = None):
@@ -95,22 +106,71 @@ class BrontoBoxDriveClient:
         self.brontobox_folder_name = ".brontobox_storage"
         self.max_retries = 3
         self.retry_delay = 1  # seconds
+        # Drive services are cached per thread: httplib2 connections are not
+        # thread-safe, but reusing one per thread keeps TLS connections alive
+        self._local = threading.local()
         
     def _get_drive_service(self, account_id: str):
-        """Get authenticated Google Drive service for an account"""
+        """
+        Get authenticated Google Drive service for an account
+        The service (and its keep-alive connection) is reused until the account's
+        stored credentials change; expired tokens are refreshed by the service's
+        authorized http on demand.
+        """
+        account = self.auth_manager.accounts.get(account_id)
+        services = getattr(self._local, 'services', None)
+        if services is None:
+            services = self._local.services = {}
+        
+        cached = services.get(account_id)
+        if account is not None and cached and cached[0] is account.credentials_encrypted:
+            return cached[1]
+        
         credentials = self.auth_manager.get_credentials(account_id)
         if not credentials:
+            services.pop(account_id, None)
             raise ValueError(f"No valid credentials for account {account_id}")
         
+        service = build('drive', 'v3', credentials=credentials)
+        # Read back after get_credentials, which may have re-encrypted refreshed tokens
+        services[account_id] = (account.credentials_encrypted, service)
+        return service
+    
+    def _build_private_service(self, account_id: str):
+        """
+        Build a Drive service with its own http connection, outside the per-thread cache
+        For streams that are advanced from whichever threadpool thread is free,
+        so they must not share the calling thread's cached connection
+        """
+        credentials = self.auth_manager.get_credentials(account_id)
+        if not credentials:
+            raise ValueError(f"No valid credentials for account {account_id}")
         return build('drive', 'v3', credentials=credentials)
     
-    def _create_brontobox_folder(self, account_id: str) -> str:
+    def _create_brontobox_folder(self, account_id: str, verify: bool = False) -> str:
         """
         Create or find the BrontoBox storage folder in Google Drive
-        Returns folder ID
+        Returns folder ID (cached for the process once found or created)
+        With verify, a cached ID is checked once per process to still exist outside the trash
         """
         service = self._get_drive_service(account_id)
         
+        folder_id = _brontobox_folder_ids.get(account_id)
+        if folder_id:
+            if not verify or folder_id in _verified_folder_ids:
+                return folder_id
+            try:
+                folder = service.files().get(fileId=folder_id, fields='trashed').execute()
+                if not folder.get('trashed'):
+                    _verified_folder_ids.add(folder_id)
+                    return folder_id
+                print(f"📁 BrontoBox folder {folder_id} was trashed, looking it up again")
+            except HttpError as e:
+                if e.resp.status != 404:
+                    return folder_id
+                print(f"📁 BrontoBox folder {folder_id} no longer exists, looking it up again")
+            _brontobox_folder_ids.pop(account_id, None)
+        
         # First, check if folder already exists
         try:
             query = f"name='{self.brontobox_folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
@@ -120,6 +180,8 @@ class BrontoBoxDriveClient:
             if items:
                 folder_id = items[0]['id']
                 print(f"📁 Found existing BrontoBox folder: {folder_id}")
+                _brontobox_folder_ids[account_id] = folder_id
+                _verified_folder_ids.add(folder_id)
                 return folder_id
         
         except Exception as e:
@@ -137,6 +199,8 @@ class BrontoBoxDriveClient:
             folder_id = folder.get('id')
             
             print(f"📁 Created BrontoBox folder: {folder_id}")
+            _brontobox_folder_ids[account_id] = folder_id
+            _verified_folder_ids.add(folder_id)
             return folder_id
             
         except Exception as e:
@@ -158,7 +222,9 @@ class BrontoBoxDriveClient:
             DriveFile object with upload details
         """
         service = self._get_drive_service(account_id)
-        folder_id = self._create_brontobox_folder(account_id)
+        # The first upload of the session checks the cached folder wasn't trashed;
+        # a folder removed later is caught by the 404 retry below
+        folder_id = self._create_brontobox_folder(account_id, verify=True)
         
         # Prepare file metadata
         file_metadata = {
@@ -240,6 +306,10 @@ class BrontoBoxDriveClient:
                     print("❌ Authentication failed!")
                     raise e
                 elif attempt < self.max_retries - 1:
+                    if error_code == 404:
+                        # Cached folder was removed from Drive; look it up again
+                        _verified_folder_ids.discard(_brontobox_folder_ids.pop(account_id, None))
+                        file_metadata['parents'] = [self._create_brontobox_folder(account_id)]
                     print(f"🔄 Retrying in {self.retry_delay} seconds...")
                     time.sleep(self.retry_delay * (attempt + 1))
                 else:
@@ -273,7 +343,7 @@ class BrontoBoxDriveClient:
                 print(f"⬇️ Downloading chunk {file_id} from {account_id} (attempt {attempt + 1}/{self.max_retries})")
                 
                 # Get file metadata first
-                file_metadata = service.files().get(fileId=file_id).execute()
+                file_metadata = service.files().get(fileId=file_id, fields='id,name,size').execute()
                 file_size = int(file_metadata.get('size', 0))
                 
                 # Download file content
@@ -324,6 +394,42 @@ class BrontoBoxDriveClient:
                     print(f"❌ Download failed: {e}")
                     raise e
     
+    def iter_download_chunk(self, account_id: str, file_id: str,
+                            block_size: int = 4 * 1024 * 1024) -> Tuple[Dict[str, Any], Iterator[bytes]]:
+        """
+        Stream an encrypted chunk from Google Drive in blocks
+        
+        Metadata is fetched up front so a missing chunk fails before any data
+        is sent; the blocks themselves are not retried once streaming starts.
+        
+        Args:
+            account_id: Account to download from
+            file_id: Google Drive file ID
+            block_size: Size of each ranged media request
+            
+        Returns:
+            Tuple of (Drive file metadata with id/name/size, iterator of data blocks)
+        """
+        # The blocks are pulled from other threads than this one, so the stream
+        # gets a connection of its own (used by one block request at a time)
+        service = self._build_private_service(account_id)
+        file_metadata = service.files().get(fileId=file_id, fields='id,name,size').execute()
+        
+        def blocks() -> Iterator[bytes]:
+            request = service.files().get_media(fileId=file_id)
+            buffer = io.BytesIO()
+            downloader = MediaIoBaseDownload(buffer, request, chunksize=block_size)
+            done = False
+            
+            while not done:
+                _, done = downloader.next_chunk()
+                if buffer.tell():
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+        
+        return file_metadata, blocks()
+    
     def delete_chunk(self, account_id: str, file_id: str) -> bool:
         """
         Delete a chunk from Google Drive
@@ -350,6 +456,94 @@ class BrontoBoxDriveClient:
             print(f"❌ Delete failed: {e}")
             return False
     
+    def get_chunk_metadata(self, account_id: str, file_id: str) -> Optional[DriveFile]:
+        """
+        Look up a single chunk by its Drive file ID
+        
+        Args:
+            account_id: Account containing the file
+            file_id: Google Drive file ID
+            
+        Returns:
+            DriveFile for the chunk, or None if it does not exist
+        """
+        service = self._get_drive_service(account_id)
+        
+        try:
+            item = service.files().get(
+                fileId=file_id,
+                fields='id,name,size,createdTime,modifiedTime,mimeType,properties,trashed'
+            ).execute()
+        except HttpError as e:
+            if e.resp.status == 404:
+                return None
+            raise
+        
+        if item.get('trashed'):
+            return None
+        return self._drive_file_from_item(item, account_id)
+    
+    def _drive_file_from_item(self, item: Dict[str, Any], account_id: str) -> DriveFile:
+        """Build a DriveFile from a Drive API file resource"""
+        properties = item.get('properties', {})
+        
+        # Parse metadata (handle both old and new formats)
+        metadata = {}
+        if 'chunk_metadata' in properties:
+            try:
+                metadata = json.loads(properties['chunk_metadata'])
+            except:
+                pass
+        
+        # Add properties as metadata
+        metadata.update(properties)
+        
+        drive_file = DriveFile(
+            file_id=item['id'],
+            name=item['name'],
+            size=int(item.get('size', 0)),
+            created_time=item['createdTime'],
+            modified_time=item.get('modifiedTime'),
+            drive_account=account_id,
+            mime_type=item.get('mimeType')
+        )
+        drive_file.metadata = metadata
+        return drive_file
+    
+    def delete_chunks(self, account_id: str, file_ids: List[str]) -> Dict[str, bool]:
+        """
+        Delete several chunks from one account using Drive batch requests
+        
+        Args:
+            account_id: Account containing the files
+            file_ids: Google Drive file IDs to delete
+            
+        Returns:
+            Mapping of file ID to whether it was deleted
+        """
+        service = self._get_drive_service(account_id)
+        file_ids = list(dict.fromkeys(file_ids))  # batch request IDs must be unique
+        results = {file_id: False for file_id in file_ids}
+        
+        def on_response(request_id, response, exception):
+            if exception is None:
+                results[request_id] = True
+            else:
+                print(f"⚠️ Delete error for {request_id}: {exception}")
+        
+        # Drive accepts at most 100 calls per batch request
+        for start in range(0, len(file_ids), 100):
+            batch = service.new_batch_http_request(callback=on_response)
+            for file_id in file_ids[start:start + 100]:
+                batch.add(service.files().delete(fileId=file_id), request_id=file_id)
+            try:
+                batch.execute()
+            except Exception as e:
+                print(f"❌ Batch delete failed: {e}")
+        
+        print(f"🗑️ Deleted {sum(results.values())}/{len(file_ids)} chunks from {account_id}")
+        return results
+    
     def list_chunks(self, account_id: str, sort_by: str = 'name', 
                    search_query: str = None, limit: int = None) -> List[DriveFile]:
         """
@@ -364,6 +558,24 @@ class BrontoBoxDriveClient:
         Returns:
             List of DriveFile objects
         """
+        return self.list_chunks_page(account_id, sort_by, search_query, limit)[0]
+    
+    def list_chunks_page(self, account_id: str, sort_by: str = 'name', search_query: str = None,
+                         limit: int = None, page_token: str = None) -> Tuple[List[DriveFile], Optional[str]]:
+        """
+        List one page of BrontoBox chunks, filtered and sorted as in list_chunks
+        ('size' and 'type' sorting is applied within the page)
+        
+        Args:
+            account_id: Account to list chunks from
+            sort_by: Sort by 'name', 'date', 'size', 'type' (default: 'name')
+            search_query: Search term to filter files
+            limit: Maximum number of files to return
+            page_token: Drive page token returned by a previous call
+            
+        Returns:
+            Tuple of (DriveFile objects, page token for the next page or None)
+        """
         service = self._get_drive_service(account_id)
         
         try:
@@ -380,11 +592,16 @@ class BrontoBoxDriveClient:
             # List files in BrontoBox folder with enhanced fields
             results = service.files().list(
                 q=query,
-                fields='files(id,name,size,createdTime,modifiedTime,mimeType,properties)',
+                fields='nextPageToken,files(id,name,size,createdTime,modifiedTime,mimeType,properties)',
                 pageSize=limit or 1000,  # Default to 1000, but respect limit
-                orderBy='name' if sort_by == 'name' else 'createdTime desc' if sort_by == 'date' else None
+                orderBy='name' if sort_by == 'name' else 'createdTime desc' if sort_by == 'date' else None,
+                pageToken=page_token
             ).execute()
             
+            if not page_token and not results.get('files'):
+                # Possibly a cached folder that was trashed or removed; look it up afresh next time
+                _verified_folder_ids.discard(_brontobox_folder_ids.pop(account_id, None))
+            
             chunks = []
             for item in results.get('files', []):
                 # Check if it's a BrontoBox chunk
@@ -394,28 +611,7 @@ class BrontoBoxDriveClient:
                                item['name'].endswith('.enc'))
                 
                 if is_brontobox:
-                    # Parse metadata (handle both old and new formats)
-                    metadata = {}
-                    if 'chunk_metadata' in properties:
-                        try:
-                            metadata = json.loads(properties['chunk_metadata'])
-                        except:
-                            pass
-                    
-                    # Add properties as metadata
-                    metadata.update(properties)
-                    
-                    drive_file = DriveFile(
-                        file_id=item['id'],
-                        name=item['name'],
-                        size=int(item.get('size', 0)),
-                        created_time=item['createdTime'],
-                        modified_time=item.get('modifiedTime'),
-                        drive_account=account_id,
-                        mime_type=item.get('mimeType')
-                    )
-                    drive_file.metadata = metadata
-                    chunks.append(drive_file)
+                    chunks.append(self._drive_file_from_item(item, account_id))
             
             # Apply sorting if not done by API
             if sort_by == 'size':
@@ -428,11 +624,11 @@ class BrontoBoxDriveClient:
                 chunks = chunks[:limit]
             
             print(f"📋 Found {len(chunks)} chunks in {account_id} (sorted by {sort_by})")
-            return chunks
+            return chunks, results.get('nextPageToken')
             
         except Exception as e:
             print(f"❌ Failed to list chunks: {e}")
-            return []
+            return [], None
     
     def search_chunks(self, account_id: str, search_term: str, 
                      search_type: str = 'all') -> List[DriveFile]:
@@ -6,10 +6,12 @@ Handles splitting and reconstructing files for distributed storage
 
 import os
 import math
+import mmap
+import time
 import hashlib
 import secrets
 import base64
-from typing import List, Dict, Any, BinaryIO
+from typing import List, Dict, Any, BinaryIO, Callable, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from crypto_manager import CryptoManager
 
@@ -41,27 +43,57 @@ class FileChunker:
         """Calculate number of chunks needed for a file"""
         return math.ceil(file_size / self.max_chunk_size)
     
-    def chunk_file(self, file_path: str, encryption_key: bytes) -> Dict[str, Any]:
+    def chunk_file(self, file_path: str, encryption_key: bytes, cipher: Any = None,
+                   file_name: str = None) -> Dict[str, Any]:
         """
         Split file into encrypted chunks
         Returns manifest with chunk information
+        cipher: optional pre-built cipher for encryption_key (see CryptoManager.create_cipher)
+        file_name: name recorded in the manifest (defaults to the file's basename)
         """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
         file_size = os.path.getsize(file_path)
-        num_chunks = self.calculate_chunks_needed(file_size)
+        cipher = cipher or self.crypto_manager.create_cipher(encryption_key)
+        
+        # Map the file and hash/encrypt zero-copy slices of it (empty files can't be mapped)
+        if file_size > 0:
+            with open(file_path, 'rb') as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                chunks, file_hash = self._encrypt_chunks(view, encryption_key, cipher)
+        else:
+            chunks, file_hash = self._encrypt_chunks(memoryview(b''), encryption_key, cipher)
+        
+        return self._build_manifest(
+            file_name or os.path.basename(file_path), file_size, file_hash, chunks,
+            os.path.getctime(file_path), os.path.getmtime(file_path)
+        )
+    
+    def chunk_bytes(self, data: bytes, file_name: str, encryption_key: bytes, cipher: Any = None) -> Dict[str, Any]:
+        """
+        Split in-memory data into encrypted chunks, without touching disk
+        Returns manifest with chunk information, same as chunk_file
+        """
+        cipher = cipher or self.crypto_manager.create_cipher(encryption_key)
+        
+        with memoryview(data) as view:
+            chunks, file_hash = self._encrypt_chunks(view, encryption_key, cipher)
+        
+        now = time.time()
+        return self._build_manifest(file_name, len(data), file_hash, chunks, now, now)
+    
+    def _encrypt_chunks(self, view: memoryview, encryption_key: bytes, cipher: Any) -> Tuple[List[FileChunk], str]:
+        """Hash and encrypt zero-copy slices of a buffer; returns chunks and the whole-file hash"""
+        num_chunks = self.calculate_chunks_needed(len(view))
         
         chunks = []
         file_hash = hashlib.sha256()
         
-        with open(file_path, 'rb') as file:
-            for chunk_index in range(num_chunks):
-                # Read chunk data
-                chunk_data = file.read(self.max_chunk_size)
-                if not chunk_data:
-                    break
-                
+        for chunk_index in range(num_chunks):
+            offset = chunk_index * self.max_chunk_size
+            with view[offset:offset + self.max_chunk_size] as chunk_data:
                 # Update file hash
                 file_hash.update(chunk_data)
                 
@@ -72,7 +104,7 @@ class FileChunker:
                 chunk_hash = self.crypto_manager.create_secure_hash(chunk_data)
                 
                 # Encrypt chunk
-                encrypted_chunk = self.crypto_manager.encrypt_data(chunk_data, encryption_key)
+                encrypted_chunk = self.crypto_manager.encrypt_data(chunk_data, encryption_key, cipher)
                 
                 # Create chunk object
                 chunk = FileChunk(
@@ -85,59 +117,69 @@ class FileChunker:
                 
                 chunks.append(chunk)
         
-        # Create file manifest
-        manifest = {
-            'file_name': os.path.basename(file_path),
+        return chunks, file_hash.hexdigest()
+    
+    def _build_manifest(self, file_name: str, file_size: int, file_hash: str, chunks: List[FileChunk],
+                        created_at: float, modified_at: float) -> Dict[str, Any]:
+        """Create file manifest"""
+        return {
+            'file_name': file_name,
             'file_size': file_size,
-            'file_hash': file_hash.hexdigest(),
+            'file_hash': file_hash,
             'num_chunks': len(chunks),
             'chunk_size': self.max_chunk_size,
             'chunks': [self._chunk_to_dict(chunk) for chunk in chunks],
-            'created_at': os.path.getctime(file_path),
-            'modified_at': os.path.getmtime(file_path)
+            'created_at': created_at,
+            'modified_at': modified_at
         }
+    
+    def iter_decrypted_chunks(self, manifest: Dict[str, Any], encryption_key: bytes,
+                              fetch_chunk: Optional[Callable[[int], bytes]] = None,
+                              cipher: Any = None) -> Iterator[bytes]:
+        """
+        Decrypt chunks in order, yielding the verified plaintext of each one
+        fetch_chunk(chunk_index) supplies the raw ciphertext when it is stored elsewhere
+        Raises ValueError if a chunk or the whole file fails its integrity check
+        """
+        cipher = cipher or self.crypto_manager.create_cipher(encryption_key)
+        file_hash = hashlib.sha256()
         
-        return manifest
+        # Sort chunks by index to ensure correct order
+        sorted_chunks = sorted(manifest['chunks'], key=lambda x: x['chunk_index'])
+        
+        for chunk_info in sorted_chunks:
+            encrypted_data = chunk_info['encrypted_data']
+            if fetch_chunk is not None:
+                ciphertext = fetch_chunk(chunk_info['chunk_index'])
+                encrypted_data = dict(encrypted_data, ciphertext=base64.b64encode(ciphertext).decode('utf-8'))
+            
+            # Decrypt chunk
+            decrypted_data = self.crypto_manager.decrypt_data(encrypted_data, encryption_key, cipher)
+            
+            # Verify chunk integrity
+            computed_hash = self.crypto_manager.create_secure_hash(decrypted_data)
+            if computed_hash != chunk_info['chunk_hash']:
+                raise ValueError(f"Chunk integrity check failed for chunk {chunk_info['chunk_index']}")
+            
+            file_hash.update(decrypted_data)
+            yield decrypted_data
+        
+        # Verify final file integrity
+        if file_hash.hexdigest() != manifest['file_hash']:
+            raise ValueError("Reconstructed file integrity check failed")
     
-    def reconstruct_file(self, manifest: Dict[str, Any], output_path: str, encryption_key: bytes) -> bool:
+    def reconstruct_file(self, manifest: Dict[str, Any], output_path: str, encryption_key: bytes,
+                         cipher: Any = None) -> bool:
         """
         Reconstruct file from chunks using manifest
         Returns True if successful
         """
         try:
-            chunks_data = []
-            
-            # Sort chunks by index to ensure correct order
-            sorted_chunks = sorted(manifest['chunks'], key=lambda x: x['chunk_index'])
-            
-            # Decrypt and collect all chunks
-            for chunk_info in sorted_chunks:
-                # Decrypt chunk
-                decrypted_data = self.crypto_manager.decrypt_data(
-                    chunk_info['encrypted_data'], 
-                    encryption_key
-                )
-                
-                # Verify chunk integrity
-                computed_hash = self.crypto_manager.create_secure_hash(decrypted_data)
-                if computed_hash != chunk_info['chunk_hash']:
-                    raise ValueError(f"Chunk integrity check failed for chunk {chunk_info['chunk_index']}")
-                
-                chunks_data.append(decrypted_data)
-            
-            # Write reconstructed file
+            # Decrypt and write chunks one at a time
             with open(output_path, 'wb') as output_file:
-                for chunk_data in chunks_data:
+                for chunk_data in self.iter_decrypted_chunks(manifest, encryption_key, cipher=cipher):
                     output_file.write(chunk_data)
             
-            # Verify final file integrity
-            with open(output_path, 'rb') as verify_file:
-                file_hash = hashlib.sha256(verify_file.read()).hexdigest()
-                
-            if file_hash != manifest['file_hash']:
-                os.remove(output_path)  # Clean up corrupted file
-                raise ValueError("Reconstructed file integrity check failed")
-            
             # Restore file timestamps
             os.utime(output_path, (manifest['created_at'], manifest['modified_at']))
             
@@ -145,6 +187,8 @@ class FileChunker:
             
         except Exception as e:
             print(f"File reconstruction failed: {e}")
+            if os.path.exists(output_path):
+                os.remove(output_path)  # Clean up corrupted file
             return False
     
     def _chunk_to_dict(self, chunk: FileChunk) -> Dict[str, Any]:
@@ -6,15 +6,18 @@ Handles Google OAuth2 flows, token management, secure storage, and correct stora
 
 import os
 import json
+import orjson
 import base64
 import secrets
 import webbrowser
 import time
+import threading
 from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import urllib.parse
 import urllib.request
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 
 # Google OAuth2 and API imports
 try:
@@ -31,6 +34,11 @@ except ImportError as e:
 # Import our VaultDrive components
 from vault_core import VaultCore
 
+# Shared pool for fanning Drive calls out across accounts. It lives as long as the
+# process so its threads keep their cached Drive services and TLS connections
+# between requests instead of rebuilding them for every call
+DRIVE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="brontobox-drive")
+
 
 @dataclass
 class GoogleAccount:
@@ -43,6 +51,9 @@ class GoogleAccount:
     is_active: bool = True
     storage_used: int = 0
     storage_total: int = 15 * 1024 * 1024 * 1024  # 15GB default
+    # Expiry of the stored access token (naive UTC, as google-auth uses), once known;
+    # kept in memory only so freshness can be checked without decrypting
+    token_expiry: Optional[datetime] = None
 
 
 class GoogleAuthManager:
@@ -73,6 +84,13 @@ class GoogleAuthManager:
         self._auth_in_progress = False
         self._last_auth_time = 0
         
+        # One lock per account: get_credentials is called from worker threads, and
+        # a refresh for one account shouldn't wait on (or race) another's
+        self._credential_locks: Dict[str, threading.Lock] = {}
+        # Drive services for quota lookups, cached per thread (httplib2 is not
+        # thread-safe) so pool threads keep their connections between calls
+        self._local = threading.local()
+        
     def setup_oauth_config(self, client_id: str, client_secret: str, project_id: str = "vaultdrive"):
         """
         Setup OAuth2 configuration
@@ -94,11 +112,11 @@ class GoogleAuthManager:
         """
         Setup OAuth2 configuration from downloaded credentials.json file
         """
-        if not os.path.exists(credentials_file):
+        try:
+            with open(credentials_file, 'r') as f:
+                self.client_config = json.load(f)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Credentials file not found: {credentials_file}")
-        
-        with open(credentials_file, 'r') as f:
-            self.client_config = json.load(f)
     
     def authenticate_new_account(self, account_name: str = None) -> str:
         """
@@ -209,14 +227,15 @@ class GoogleAuthManager:
             }
             
             # Encrypt credentials using vault's token encryption key
-            encrypted_credentials = self.vault_core.crypto_manager.encrypt_data(
-                json.dumps(credentials_data).encode('utf-8'),
-                self.vault_core.master_keys['token_encryption']
+            encrypted_credentials = self.vault_core.encrypt_with_key(
+                'token_encryption',
+                orjson.dumps(credentials_data)
             )
             
             if existing_account:
                 # Update existing account
                 existing_account.credentials_encrypted = encrypted_credentials
+                existing_account.token_expiry = credentials.expiry
                 existing_account.last_used = datetime.now()
                 existing_account.is_active = True
             else:
@@ -226,7 +245,8 @@ class GoogleAuthManager:
                     account_id=account_id,
                     credentials_encrypted=encrypted_credentials,
                     created_at=datetime.now(),
-                    last_used=datetime.now()
+                    last_used=datetime.now(),
+                    token_expiry=credentials.expiry
                 )
                 
                 # Store account
@@ -267,14 +287,20 @@ class GoogleAuthManager:
         
         account = self.accounts[account_id]
         
+        # dict.setdefault is atomic, so concurrent callers always share one lock
+        with self._credential_locks.setdefault(account_id, threading.Lock()):
+            return self._load_credentials(account_id, account)
+    
+    def _load_credentials(self, account_id: str, account: GoogleAccount) -> Optional[Credentials]:
+        """Decrypt an account's credentials, refreshing them if expired (call with its lock held)"""
         try:
             # Decrypt credentials
-            credentials_json = self.vault_core.crypto_manager.decrypt_data(
-                account.credentials_encrypted,
-                self.vault_core.master_keys['token_encryption']
+            credentials_json = self.vault_core.decrypt_with_key(
+                'token_encryption',
+                account.credentials_encrypted
             )
             
-            credentials_data = json.loads(credentials_json.decode('utf-8'))
+            credentials_data = orjson.loads(credentials_json)
             
             # Create Credentials object
             credentials = Credentials(
@@ -298,6 +324,8 @@ class GoogleAuthManager:
                 # Update stored credentials
                 self._update_stored_credentials(account_id, credentials)
             
+            account.token_expiry = credentials.expiry
+            
             # Update last used time
             account.last_used = datetime.now()
             
@@ -307,6 +335,20 @@ class GoogleAuthManager:
             print(f"❌ Failed to decrypt credentials for {account_id}: {e}")
             return None
     
+    def needs_token_refresh(self, account_id: str, margin: timedelta = timedelta(minutes=5)) -> bool:
+        """
+        Check whether an account's access token may expire within margin
+        Accounts whose token expiry isn't known yet are reported as needing a refresh
+        """
+        account = self.accounts.get(account_id)
+        if account is None or account.token_expiry is None:
+            return True
+        # google-auth stores expiry as naive UTC; compare in aware UTC either way
+        expiry = account.token_expiry
+        if expiry.tzinfo is None:
+            expiry = expiry.replace(tzinfo=timezone.utc)
+        return expiry <= datetime.now(timezone.utc) + margin
+    
     def _update_stored_credentials(self, account_id: str, credentials: Credentials):
         """Update stored credentials after token refresh"""
         account = self.accounts[account_id]
@@ -322,9 +364,9 @@ class GoogleAuthManager:
         }
         
         # Re-encrypt updated credentials
-        encrypted_credentials = self.vault_core.crypto_manager.encrypt_data(
-            json.dumps(credentials_data).encode('utf-8'),
-            self.vault_core.master_keys['token_encryption']
+        encrypted_credentials = self.vault_core.encrypt_with_key(
+            'token_encryption',
+            orjson.dumps(credentials_data)
         )
         
         account.credentials_encrypted = encrypted_credentials
@@ -415,14 +457,38 @@ class GoogleAuthManager:
             'is_unlimited': is_unlimited
         }
     
+    def _get_cached_drive_service(self, account_id: str):
+        """
+        Get this thread's Drive service for an account, or None without credentials
+        Rebuilt only when the account's stored credentials change
+        """
+        account = self.accounts.get(account_id)
+        services = getattr(self._local, 'services', None)
+        if services is None:
+            services = self._local.services = {}
+        
+        cached = services.get(account_id)
+        if account is not None and cached and cached[0] is account.credentials_encrypted:
+            return cached[1]
+        
+        credentials = self.get_credentials(account_id)
+        if not credentials:
+            services.pop(account_id, None)
+            return None
+        
+        service = build('drive', 'v3', credentials=credentials)
+        # Read back after get_credentials, which may have re-encrypted refreshed tokens
+        services[account_id] = (account.credentials_encrypted, service)
+        return service
+    
     # NEW: FIXED storage info method
     def get_storage_info(self, account_id: str) -> Dict[str, Any]:
         """
         SMART: Get storage information with workspace account detection
         Handles personal vs workspace accounts differently
         """
-        credentials = self.get_credentials(account_id)
-        if not credentials:
+        drive_service = self._get_cached_drive_service(account_id)
+        if drive_service is None:
             return {
                 'total_gb': 15.0,
                 'used_gb': 0.0,
@@ -431,8 +497,6 @@ class GoogleAuthManager:
             }
         
         try:
-            # Build Drive service
-            drive_service = build('drive', 'v3', credentials=credentials)
             
             # Get storage quota AND user info
             response = drive_service.about().get(fields='storageQuota,user').execute()
@@ -468,23 +532,44 @@ class GoogleAuthManager:
     
     def list_accounts(self) -> List[Dict[str, Any]]:
         """List all stored accounts with smart storage info"""
-        accounts_info = []
-        for account_id, account in self.accounts.items():
-            # Get smart storage info
-            storage_info = self.get_storage_info(account_id)
-            
-            account_info = {
-                'account_id': account_id,
-                'email': account.email,
-                'created_at': account.created_at.isoformat(),
-                'last_used': account.last_used.isoformat(),
-                'is_active': account.is_active,
-                'is_current': account_id == self.active_account,
-                'storage_info': storage_info
-            }
-            accounts_info.append(account_info)
+        accounts = list(self.accounts.items())
+        
+        # Get smart storage info - one network round-trip per account, run concurrently
+        storage_infos = list(DRIVE_EXECUTOR.map(self.get_storage_info, [account_id for account_id, _ in accounts]))
+        
+        return [self._build_account_info(account_id, account, storage_info)
+                for (account_id, account), storage_info in zip(accounts, storage_infos)]
+    
+    def get_account_info(self, account_id: str, with_storage: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Get info for one account (same shape as list_accounts entries) without
+        fetching storage info for every other account
+        
+        Args:
+            account_id: Account to look up
+            with_storage: Also fetch the account's Drive storage info
             
-        return accounts_info
+        Returns:
+            Account info dict or None if the account is unknown
+        """
+        account = self.accounts.get(account_id)
+        if account is None:
+            return None
+        storage_info = self.get_storage_info(account_id) if with_storage else None
+        return self._build_account_info(account_id, account, storage_info)
+    
+    def _build_account_info(self, account_id: str, account: GoogleAccount,
+                            storage_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the account info dict exposed by the API"""
+        return {
+            'account_id': account_id,
+            'email': account.email,
+            'created_at': account.created_at.isoformat(),
+            'last_used': account.last_used.isoformat(),
+            'is_active': account.is_active,
+            'is_current': account_id == self.active_account,
+            'storage_info': storage_info
+        }
     
     def set_active_account(self, account_id: str) -> bool:
         """Set the active account for operations"""
@@ -497,6 +582,7 @@ class GoogleAuthManager:
         """Remove an account (WARNING: This will delete stored credentials)"""
         if account_id in self.accounts:
             del self.accounts[account_id]
+            self._credential_locks.pop(account_id, None)
             
             # Update active account if needed
             if self.active_account == account_id:
@@ -629,9 +715,9 @@ class GoogleAuthManager:
         }
         
         # Encrypt the entire vault data
-        encrypted_vault = self.vault_core.crypto_manager.encrypt_data(
-            json.dumps(vault_data).encode('utf-8'),
-            self.vault_core.master_keys['vault_unlock']
+        encrypted_vault = self.vault_core.encrypt_with_key(
+            'vault_unlock',
+            orjson.dumps(vault_data)
         )
         
         return encrypted_vault
@@ -645,12 +731,12 @@ class GoogleAuthManager:
         
         try:
             # Decrypt vault data
-            vault_json = self.vault_core.crypto_manager.decrypt_data(
-                encrypted_vault_data,
-                self.vault_core.master_keys['vault_unlock']
+            vault_json = self.vault_core.decrypt_with_key(
+                'vault_unlock',
+                encrypted_vault_data
             )
             
-            vault_data = json.loads(vault_json.decode('utf-8'))
+            vault_data = orjson.loads(vault_json)
             
             # Restore accounts
             self.accounts = {}
@@ -5,19 +5,22 @@ Auto-scans and displays all BrontoBox files across accounts with original names
 """
 
 import os
-import json
+import orjson
 import hashlib
 import secrets
 import time
 import base64
 import re
-from typing import Dict, Any, List, Optional, Tuple
+import bisect
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Iterator
 from datetime import datetime
 from dataclasses import dataclass
+from concurrent.futures import wait, FIRST_EXCEPTION
 
 # BrontoBox imports
 from vault_core import VaultCore
-from google_auth import GoogleAuthManager
+from google_auth import GoogleAuthManager, DRIVE_EXECUTOR
 from drive_client import BrontoBoxDriveClient, DriveFile
 
 
@@ -67,6 +70,18 @@ class BrontoBoxStorageManager:
         self.auth_manager = auth_manager
         self.drive_client = BrontoBoxDriveClient(auth_manager)
         self.stored_files: Dict[str, StoredFile] = {}
+        # Bumped on every change to stored_files; keys cached API responses
+        self.files_version = 0
+        # Ready-to-serialize file listing (newest first) with a parallel list of
+        # sort keys for bisecting; kept in step with single adds and deletes,
+        # and set to None after bulk changes so the next read rebuilds it
+        self._file_info_cache: Optional[List[Dict[str, Any]]] = None
+        self._file_sort_keys: List[Tuple[float, str]] = []
+        # Auto-discovered files in the listing, maintained alongside it
+        self._discovered_count = 0
+        self._listing_lock = threading.RLock()
+        # account_id -> {file_id: chunks held}, rebuilt when files_version moves on
+        self._account_chunk_index: Optional[Tuple[int, Dict[str, Dict[str, int]]]] = None
         
         # Auto-scan for existing files when initialized
         self.auto_scan_existing_files()
@@ -82,15 +97,24 @@ class BrontoBoxStorageManager:
         print("Auto-scanning for existing BrontoBox files...")
         
         try:
-            available_accounts = self.get_available_accounts()
+            # Discovery only needs the chunk listings, not quota, so skip the
+            # storage-info round trip that get_available_accounts() makes
+            active_accounts = [account for account in self.auth_manager.accounts.values() if account.is_active]
             total_discovered = 0
             
-            for account in available_accounts:
-                account_id = account['account_id']
-                print(f"Scanning account: {account['email']}")
-                
-                # Get all BrontoBox chunks for this account
-                chunks = self.drive_client.list_chunks(account_id)
+            # Listing chunks is one paged Drive query per account; run them concurrently
+            # and process the results in account order
+            def list_account_chunks(account):
+                try:
+                    return self.drive_client.list_chunks(account.account_id)
+                except Exception as e:
+                    print(f"Could not scan {account.email}: {e}")
+                    return []
+            
+            all_chunks = list(DRIVE_EXECUTOR.map(list_account_chunks, active_accounts))
+            
+            for account, chunks in zip(active_accounts, all_chunks):
+                print(f"Scanning account: {account.email}")
                 
                 # Group chunks by BrontoBox file ID
                 file_groups = self._group_chunks_by_file_id(chunks)
@@ -102,6 +126,7 @@ class BrontoBoxStorageManager:
                         
                         if discovered_file:
                             self.stored_files[brontobox_file_id] = discovered_file
+                            self.mark_files_changed()
                             total_discovered += 1
                             print(f"  Discovered: {discovered_file.original_name}")
             
@@ -207,63 +232,103 @@ class BrontoBoxStorageManager:
     
     def get_available_accounts(self) -> List[Dict[str, Any]]:
         """Get list of available Google accounts with storage info"""
-        accounts = self.auth_manager.list_accounts()
+        accounts = [account for account in self.auth_manager.accounts.values() if account.is_active]
         account_info = []
         
-        for account in accounts:
-            if account['is_active']:
-                try:
-                    storage_info = self.drive_client.get_storage_info(account['account_id'])
-                    if 'error' not in storage_info:
-                        account_info.append({
-                            'account_id': account['account_id'],
-                            'email': account['email'],
-                            'available_gb': storage_info['available_gb'],
-                            'usage_percentage': storage_info['usage_percentage'],
-                            'storage_info': storage_info
-                        })
-                except Exception as e:
-                    print(f"Could not get storage info for {account['email']}: {e}")
+        def fetch_storage_info(account):
+            try:
+                return self.drive_client.get_storage_info(account.account_id)
+            except Exception as e:
+                print(f"Could not get storage info for {account.email}: {e}")
+                return None
+        
+        # Quota lookups are independent network round-trips, so query all accounts at once
+        storage_infos = list(DRIVE_EXECUTOR.map(fetch_storage_info, accounts))
+        
+        for account, storage_info in zip(accounts, storage_infos):
+            if storage_info and 'error' not in storage_info:
+                account_info.append({
+                    'account_id': account.account_id,
+                    'email': account.email,
+                    'available_gb': storage_info['available_gb'],
+                    'usage_percentage': storage_info['usage_percentage'],
+                    'storage_info': storage_info
+                })
         
         # Sort by available space (most available first)
         account_info.sort(key=lambda x: x['available_gb'], reverse=True)
         return account_info
     
-    def _select_account_for_chunk(self, chunk_size_bytes: int, exclude_accounts: List[str] = None) -> Optional[str]:
+    def _delete_uploaded_chunks(self, uploaded_chunks: List[Dict[str, Any]]):
+        """Roll back a failed upload by deleting its chunks, one batch request per account"""
+        file_ids_by_account: Dict[str, List[str]] = {}
+        for chunk in uploaded_chunks:
+            file_ids_by_account.setdefault(chunk['drive_account'], []).append(chunk['drive_file_id'])
+        
+        def delete_account_chunks(drive_account: str) -> int:
+            try:
+                results = self.drive_client.delete_chunks(drive_account, file_ids_by_account[drive_account])
+            except Exception as e:
+                print(f"   Could not roll back chunks in {drive_account}: {e}")
+                return 0
+            return sum(results.values())
+        
+        removed = sum(DRIVE_EXECUTOR.map(delete_account_chunks, list(file_ids_by_account)))
+        print(f"   Rolled back {removed}/{len(uploaded_chunks)} uploaded chunks")
+    
+    def _plan_chunk_accounts(self, chunk_sizes: List[int]) -> List[str]:
         """
-        Select the best account for storing a chunk
+        Choose an account for every chunk up front from a single storage snapshot
+        
+        Spreads the first chunks over different accounts and otherwise prefers the
+        account with the most available space, querying Drive quota once per file
+        rather than once per chunk.
         
         Args:
-            chunk_size_bytes: Size of chunk to store
-            exclude_accounts: Accounts to exclude from selection
+            chunk_sizes: Size in bytes of each chunk, in chunk order
             
         Returns:
-            Account ID or None if no suitable account found
+            Account ID for each chunk, in chunk order
         """
-        available_accounts = self.get_available_accounts()
-        exclude_accounts = exclude_accounts or []
+        available = self.get_available_accounts()
+        if not available:
+            raise RuntimeError("No available Google accounts with sufficient storage")
         
-        # Filter out excluded accounts and accounts with insufficient space
-        chunk_size_gb = chunk_size_bytes / (1024**3)
-        suitable_accounts = [
-            acc for acc in available_accounts 
-            if acc['account_id'] not in exclude_accounts 
-            and acc['available_gb'] > chunk_size_gb + 0.1  # Leave some buffer
-        ]
+        remaining_gb = {acc['account_id']: acc['available_gb'] for acc in available}
+        used_accounts = []
+        plan = []
         
-        if not suitable_accounts:
-            return None
+        for chunk_size in chunk_sizes:
+            chunk_size_gb = chunk_size / (1024**3)
+            exclude_accounts = used_accounts if len(used_accounts) < 2 else []
+            
+            suitable_accounts = [
+                account_id for account_id in remaining_gb
+                if account_id not in exclude_accounts
+                and remaining_gb[account_id] > chunk_size_gb + 0.1  # Leave some buffer
+            ]
+            
+            if suitable_accounts:
+                account_id = max(suitable_accounts, key=lambda acc: remaining_gb[acc])
+            else:
+                # If no suitable account found, use any available account
+                account_id = available[0]['account_id']
+            
+            remaining_gb[account_id] -= chunk_size_gb
+            if account_id not in used_accounts:
+                used_accounts.append(account_id)
+            plan.append(account_id)
         
-        # Return account with most available space
-        return suitable_accounts[0]['account_id']
+        return plan
     
-    def store_file(self, file_path: str, metadata: Dict[str, Any] = None) -> str:
+    def store_file(self, file_path: str, metadata: Dict[str, Any] = None, file_name: str = None) -> str:
         """
         Store a file in BrontoBox distributed storage
         
         Args:
             file_path: Path to file to store
             metadata: Additional metadata to store with file
+            file_name: Original file name, if different from the file's basename
             
         Returns:
             File ID for the stored file
@@ -274,11 +339,47 @@ class BrontoBoxStorageManager:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        print(f"BrontoBox: Storing file {os.path.basename(file_path)}")
+        print(f"BrontoBox: Storing file {file_name or os.path.basename(file_path)}")
         
         # Step 1: Encrypt and chunk the file
         print("Encrypting and chunking file...")
-        encrypted_result = self.vault.encrypt_file(file_path)
+        encrypted_result = self.vault.encrypt_file(file_path, file_name)
+        
+        return self._upload_encrypted_file(encrypted_result, metadata)
+    
+    def store_bytes(self, data: bytes, file_name: str, metadata: Dict[str, Any] = None) -> str:
+        """
+        Store in-memory data in BrontoBox distributed storage, skipping the temp file
+        
+        Args:
+            data: File content
+            file_name: Original file name
+            metadata: Additional metadata to store with file
+            
+        Returns:
+            File ID for the stored file
+        """
+        if not self.vault.is_unlocked:
+            raise RuntimeError("Vault must be unlocked to store files")
+        
+        print(f"BrontoBox: Storing file {file_name} from memory")
+        
+        # Step 1: Encrypt and chunk the data
+        encrypted_result = self.vault.encrypt_bytes(data, file_name)
+        
+        return self._upload_encrypted_file(encrypted_result, metadata)
+    
+    def _upload_encrypted_file(self, encrypted_result: Dict[str, Any], metadata: Dict[str, Any] = None) -> str:
+        """
+        Upload the chunks of an encrypted file and record it in the file registry
+        
+        Args:
+            encrypted_result: Output of VaultCore.encrypt_file / encrypt_bytes
+            metadata: Additional metadata to store with file
+            
+        Returns:
+            File ID for the stored file
+        """
         file_manifest = encrypted_result['file_manifest']
         
         # Generate unique file ID
@@ -287,25 +388,22 @@ class BrontoBoxStorageManager:
         # Step 2: Upload chunks to Google Drive accounts
         print(f"Uploading {len(file_manifest['chunks'])} chunks to Google Drive...")
         
-        uploaded_chunks = []
+        # Convert base64 encrypted data to bytes
+        chunks_data = [base64.b64decode(chunk_info['encrypted_data']['ciphertext'])
+                       for chunk_info in file_manifest['chunks']]
+        
+        # Select accounts for all chunks (try to distribute across different accounts)
+        chunk_accounts = self._plan_chunk_accounts([len(data) for data in chunks_data])
+        
         used_accounts = []
+        for account_id in chunk_accounts:
+            if account_id not in used_accounts:
+                used_accounts.append(account_id)
         
-        for i, chunk_info in enumerate(file_manifest['chunks']):
-            # Convert base64 encrypted data to bytes
-            chunk_data = base64.b64decode(chunk_info['encrypted_data']['ciphertext'])
-            
-            # Select account for this chunk (try to distribute across different accounts)
-            account_id = self._select_account_for_chunk(
-                len(chunk_data), 
-                exclude_accounts=used_accounts if len(used_accounts) < 2 else []
-            )
-            
-            if not account_id:
-                # If no suitable account found, use any available account
-                available = self.get_available_accounts()
-                if not available:
-                    raise RuntimeError("No available Google accounts with sufficient storage")
-                account_id = available[0]['account_id']
+        def upload_one(i: int):
+            chunk_info = file_manifest['chunks'][i]
+            chunk_data = chunks_data[i]
+            account_id = chunk_accounts[i]
             
             # Create chunk name
             chunk_name = f"{file_id}_chunk_{i:03d}_{chunk_info['chunk_id']}.enc"
@@ -327,29 +425,54 @@ class BrontoBoxStorageManager:
                     chunk_name=chunk_name,
                     metadata=chunk_metadata
                 )
-                
-                # Record upload info
-                uploaded_chunk = {
-                    'chunk_index': i,
-                    'chunk_id': chunk_info['chunk_id'],
-                    'chunk_hash': chunk_info['chunk_hash'],
-                    'chunk_size': len(chunk_data),
-                    'drive_file_id': drive_file.file_id,
-                    'drive_account': account_id,
-                    'drive_file_name': drive_file.name,
-                    'uploaded_at': datetime.now().isoformat()
-                }
-                uploaded_chunks.append(uploaded_chunk)
-                
-                if account_id not in used_accounts:
-                    used_accounts.append(account_id)
-                
-                print(f"   Chunk {i+1}/{len(file_manifest['chunks'])} → {account_id}")
-                
             except Exception as e:
                 print(f"   Failed to upload chunk {i}: {e}")
-                # TODO: Implement rollback - delete already uploaded chunks
-                raise e
+                raise
+            
+            print(f"   Chunk {i+1}/{len(file_manifest['chunks'])} → {account_id}")
+            
+            # Record upload info (as soon as it lands, so a failed upload can roll it back)
+            chunk_record = {
+                'chunk_index': i,
+                'chunk_id': chunk_info['chunk_id'],
+                'chunk_hash': chunk_info['chunk_hash'],
+                'chunk_size': len(chunk_data),
+                'drive_file_id': drive_file.file_id,
+                'drive_account': account_id,
+                'drive_file_name': drive_file.name,
+                'uploaded_at': datetime.now().isoformat()
+            }
+            uploaded_chunks.append(chunk_record)
+        
+        def upload_account_chunks(chunk_indexes: List[int]):
+            for i in chunk_indexes:
+                if abort.is_set():
+                    return
+                upload_one(i)
+        
+        # Chunks for the same account go up one after another, different accounts
+        # upload in parallel, so wall time is the slowest account rather than the sum
+        chunks_by_account: Dict[str, List[int]] = {}
+        for i, account_id in enumerate(chunk_accounts):
+            chunks_by_account.setdefault(account_id, []).append(i)
+        
+        uploaded_chunks: List[Dict[str, Any]] = []
+        abort = threading.Event()
+        futures = [DRIVE_EXECUTOR.submit(upload_account_chunks, chunk_indexes)
+                   for chunk_indexes in chunks_by_account.values()]
+        # Wake on the first failure rather than after earlier accounts finish
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        error = next((future.exception() for future in done if future.exception()), None)
+        if error is not None:
+            # Stop the other accounts, let in-flight chunks finish, then remove
+            # everything that made it to Drive so no orphaned chunks are left
+            abort.set()
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            self._delete_uploaded_chunks(uploaded_chunks)
+            raise error
+        uploaded_chunks.sort(key=lambda chunk: chunk['chunk_index'])
         
         # Step 3: Create stored file record
         stored_file = StoredFile(
@@ -372,6 +495,7 @@ class BrontoBoxStorageManager:
         
         # Store file record
         self.stored_files[file_id] = stored_file
+        self._file_added(file_id, stored_file)
         
         print(f"File stored successfully!")
         print(f"   File ID: {file_id}")
@@ -380,246 +504,181 @@ class BrontoBoxStorageManager:
         
         return file_id
     
-    def retrieve_file(self, file_id: str, output_path: str) -> bool:
+    def iter_file_content(self, file_id: str) -> Iterator[bytes]:
         """
-        Retrieve and decrypt a file from BrontoBox storage - ENHANCED FOR RESTORED FILES
+        Stream a file from BrontoBox storage chunk by chunk, without staging it on disk
         
         Args:
-            file_id: ID of file to retrieve
-            output_path: Where to save the decrypted file
+            file_id: ID of file to stream
             
         Returns:
-            True if successful, False otherwise
+            Iterator over the decrypted content, one chunk at a time. Files without
+            an encrypted manifest (discovered from Drive) yield their raw chunk data.
         """
         if not self.vault.is_unlocked:
             raise RuntimeError("Vault must be unlocked to retrieve files")
         
         if file_id not in self.stored_files:
-            print(f"File not found: {file_id}")
-            return False
+            raise FileNotFoundError(f"File not found: {file_id}")
         
         stored_file = self.stored_files[file_id]
-        print(f"BrontoBox: Retrieving file {stored_file.original_name}")
-        
-        # Check file type and use appropriate retrieval method
-        is_discovered = stored_file.metadata.get('discovered_from_chunks', False)
-        is_imported = stored_file.metadata.get('imported_from_registry', False)
-        has_manifest = 'encrypted_manifest' in stored_file.metadata
-        
-        print(f"File type: discovered={is_discovered}, imported={is_imported}, has_manifest={has_manifest}")
+        chunks_by_index = {chunk['chunk_index']: chunk for chunk in stored_file.chunks}
         
-        # Method 1: Try normal retrieval with encrypted manifest (best quality)
-        if has_manifest and not is_discovered:
-            print("Using Method 1: Normal retrieval with encrypted manifest")
-            return self._retrieve_with_manifest(stored_file, output_path)
+        def fetch_chunk(chunk_index: int) -> bytes:
+            chunk_info = chunks_by_index[chunk_index]
+            return self.drive_client.download_chunk(chunk_info['drive_account'], chunk_info['drive_file_id'])
         
-        # Method 2: Try to reconstruct manifest from chunks (for restored files)
-        elif is_imported or len(stored_file.chunks) > 0:
-            print("Using Method 2: Reconstruct from chunk metadata")
-            return self._retrieve_from_chunk_reconstruction(stored_file, output_path)
+        is_discovered = stored_file.metadata.get('discovered_from_chunks', False)
+        if 'encrypted_manifest' in stored_file.metadata and not is_discovered:
+            return self.vault.iter_decrypt_file(stored_file.metadata['encrypted_manifest'], fetch_chunk)
         
-        # Method 3: Fallback discovered file method
-        else:
-            print("Using Method 3: Discovered file fallback")
-            return self._retrieve_discovered_file(stored_file, output_path)
+        return (fetch_chunk(chunk_index) for chunk_index in sorted(chunks_by_index))
     
-    def _retrieve_with_manifest(self, stored_file: StoredFile, output_path: str) -> bool:
-        """Method 1: Normal retrieval with encrypted manifest"""
-        try:
-            # Download all chunks
-            print(f"Downloading {len(stored_file.chunks)} chunks...")
-            
-            downloaded_chunks = {}
-            
-            for chunk_info in stored_file.chunks:
-                chunk_index = chunk_info['chunk_index']
-                drive_file_id = chunk_info['drive_file_id']
-                drive_account = chunk_info['drive_account']
-                
-                try:
-                    print(f"   Downloading chunk {chunk_index + 1}/{len(stored_file.chunks)} from {drive_account}")
-                    
-                    # Download encrypted chunk data
-                    encrypted_chunk_data = self.drive_client.download_chunk(drive_account, drive_file_id)
-                    
-                    # Store encrypted chunk data for reconstruction
-                    downloaded_chunks[chunk_index] = encrypted_chunk_data
-                    print(f"   Chunk {chunk_index + 1} downloaded ({len(encrypted_chunk_data)} bytes)")
-                    
-                except Exception as e:
-                    print(f"Failed to download chunk {chunk_index}: {e}")
-                    return False
-            
-            # Reconstruct encrypted manifest
-            print("Reconstructing file...")
-            
-            # Get encrypted manifest from metadata
-            encrypted_manifest = stored_file.metadata['encrypted_manifest']
-            
-            # Rebuild file manifest with downloaded chunk data
-            try:
-                decrypted_manifest_json = self.vault.crypto_manager.decrypt_data(
-                    encrypted_manifest,
-                    self.vault.master_keys['metadata_encryption']
-                )
-                file_manifest = json.loads(decrypted_manifest_json.decode('utf-8'))
-            except Exception as e:
-                print(f"Failed to decrypt manifest: {e}")
-                return False
-            
-            # Update manifest chunks with downloaded encrypted data
-            for i, chunk_info in enumerate(file_manifest['chunks']):
-                if i in downloaded_chunks:
-                    chunk_info['encrypted_data']['ciphertext'] = base64.b64encode(downloaded_chunks[i]).decode('utf-8')
-            
-            # Decrypt and reconstruct file
-            encrypted_result = {
-                'file_manifest': file_manifest,
-                'encrypted_manifest': encrypted_manifest,
-                'total_chunks': len(file_manifest['chunks']),
-                'total_size': file_manifest['file_size']
-            }
-            
-            try:
-                success = self.vault.decrypt_file(encrypted_result, output_path)
-            except Exception as e:
-                print(f"File decryption failed: {e}")
-                return False
+    def list_stored_files(self) -> List[Dict[str, Any]]:
+        """
+        ENHANCED: List all files stored in BrontoBox (including auto-discovered ones)
+        The listing is kept up to date as files are stored and deleted
+        """
+        with self._listing_lock:
+            return list(self._cached_listing())
+    
+    def list_stored_files_page(self, limit: int, after_id: str = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List one page of stored files, in the same order as list_stored_files
+        
+        Args:
+            limit: Maximum number of files to return
+            after_id: Continue after this file ID (the last file of the previous page)
             
-            if success:
-                print(f"File retrieved successfully: {output_path}")
-                return True
+        Returns:
+            Tuple of (files on this page, file ID to continue after or None on the last page)
+        """
+        with self._listing_lock:
+            files_info = self._cached_listing()
+            
+            start = 0
+            if after_id is not None:
+                start = self._listing_position(after_id)
+                if start is None:
+                    raise ValueError(f"Unknown file ID in cursor: {after_id}")
+                start += 1
+            
+            page = files_info[start:start + limit]
+            next_after_id = page[-1]['file_id'] if start + limit < len(files_info) else None
+            return page, next_after_id
+    
+    def _cached_listing(self) -> List[Dict[str, Any]]:
+        """Return the sorted listing, rebuilding it after a bulk change (call with _listing_lock held)"""
+        if self._file_info_cache is None:
+            entries = sorted((self._listing_sort_key(file_id, stored_file), file_id, stored_file)
+                             for file_id, stored_file in list(self.stored_files.items()))
+            self._file_sort_keys = [key for key, _, _ in entries]
+            self._file_info_cache = [self._build_file_info(file_id, stored_file)
+                                     for _, file_id, stored_file in entries]
+            self._discovered_count = sum(1 for info in self._file_info_cache if info['is_discovered'])
+        return self._file_info_cache
+    
+    def _listing_sort_key(self, file_id: str, stored_file: StoredFile) -> Tuple[float, str]:
+        """Sort key for the listing: newest first, ties broken by file ID"""
+        return (-stored_file.created_at.timestamp(), file_id)
+    
+    def _listing_position(self, file_id: str) -> Optional[int]:
+        """Position of a file in the cached listing, or None if it is not listed"""
+        stored_file = self.stored_files.get(file_id)
+        if stored_file is None:
+            return None
+        key = self._listing_sort_key(file_id, stored_file)
+        index = bisect.bisect_left(self._file_sort_keys, key)
+        if index < len(self._file_sort_keys) and self._file_sort_keys[index] == key:
+            return index
+        return None
+    
+    def _file_added(self, file_id: str, stored_file: StoredFile):
+        """Insert one newly stored file into the cached listing"""
+        with self._listing_lock:
+            self.files_version += 1
+            if self._file_info_cache is None:
+                return
+            key = self._listing_sort_key(file_id, stored_file)
+            index = bisect.bisect_left(self._file_sort_keys, key)
+            file_info = self._build_file_info(file_id, stored_file)
+            if index < len(self._file_sort_keys) and self._file_sort_keys[index] == key:
+                # A rebuild already picked it up
+                self._discovered_count -= self._file_info_cache[index]['is_discovered']
+                self._file_info_cache[index] = file_info
             else:
-                print("File decryption failed")
-                return False
-                
-        except Exception as e:
-            print(f"Method 1 failed: {e}")
-            return False
+                self._file_sort_keys.insert(index, key)
+                self._file_info_cache.insert(index, file_info)
+            self._discovered_count += file_info['is_discovered']
     
-    def _retrieve_from_chunk_reconstruction(self, stored_file: StoredFile, output_path: str) -> bool:
-        """Method 2: Reconstruct file from chunk metadata (for restored files)"""
-        try:
-            print(f"Reconstructing file from {len(stored_file.chunks)} chunks...")
-            
-            # Download all chunks in order
-            chunk_data_list = []
-            
-            for chunk_info in sorted(stored_file.chunks, key=lambda x: x['chunk_index']):
-                drive_file_id = chunk_info['drive_file_id']
-                drive_account = chunk_info['drive_account']
-                
-                try:
-                    print(f"   Downloading chunk {chunk_info['chunk_index'] + 1}")
-                    encrypted_chunk_data = self.drive_client.download_chunk(drive_account, drive_file_id)
-                    chunk_data_list.append(encrypted_chunk_data)
-                except Exception as e:
-                    print(f"Failed to download chunk {chunk_info['chunk_index']}: {e}")
-                    return False
-            
-            # For restored files, try direct concatenation first
-            print("Attempting direct file reconstruction...")
-            
-            # Concatenate all chunk data
-            combined_data = b''.join(chunk_data_list)
-            
-            # Try to decrypt the combined data as a single encrypted file
-            # This works if the chunks were stored as encrypted pieces of the original file
-            try:
-                # Save combined data to output
-                with open(output_path, 'wb') as f:
-                    f.write(combined_data)
-                
-                print(f"File saved as concatenated chunks. May need manual processing.")
-                print(f"   File saved to: {output_path}")
-                print(f"   Size: {len(combined_data)} bytes")
-                
-                # Try to detect if this looks like an encrypted BrontoBox file
-                if combined_data.startswith(b'{') or combined_data.startswith(b'PK'):
-                    print("File appears to be readable - reconstruction may have worked!")
-                
-                return True
-                
-            except Exception as e:
-                print(f"Failed to save reconstructed file: {e}")
-                return False
-                
-        except Exception as e:
-            print(f"Method 2 failed: {e}")
-            return False
+    def _file_removed(self, file_id: str, stored_file: StoredFile):
+        """Drop one deleted file from the cached listing"""
+        with self._listing_lock:
+            self.files_version += 1
+            if self._file_info_cache is None:
+                return
+            key = self._listing_sort_key(file_id, stored_file)
+            index = bisect.bisect_left(self._file_sort_keys, key)
+            if index < len(self._file_sort_keys) and self._file_sort_keys[index] == key:
+                del self._file_sort_keys[index]
+                self._discovered_count -= self._file_info_cache.pop(index)['is_discovered']
     
-    def _retrieve_discovered_file(self, stored_file: StoredFile, output_path: str) -> bool:
-        """
-        SPECIAL HANDLING: Retrieve files that were discovered from chunks
-        These don't have the full encrypted manifest, so we reconstruct it
+    def get_file_counts(self) -> Dict[str, int]:
+        """Get total, auto-discovered and user-uploaded file counts without scanning the listing"""
+        with self._listing_lock:
+            total = len(self._cached_listing())
+            discovered = self._discovered_count
+        return {'total': total, 'discovered': discovered, 'uploaded': total - discovered}
+    
+    def get_account_chunk_counts(self, account_id: str) -> Dict[str, int]:
+        """Get {file_id: number of chunks stored in account_id} for files using that account"""
+        with self._listing_lock:
+            index = self._account_chunk_index
+            if index is None or index[0] != self.files_version:
+                by_account: Dict[str, Dict[str, int]] = {}
+                for file_id, stored_file in self.stored_files.items():
+                    for chunk_info in stored_file.chunks:
+                        counts = by_account.setdefault(chunk_info['drive_account'], {})
+                        counts[file_id] = counts.get(file_id, 0) + 1
+                index = self._account_chunk_index = (self.files_version, by_account)
+            return index[1].get(account_id, {})
+    
+    def mark_files_changed(self):
+        """Invalidate the cached listing after stored_files is modified in bulk"""
+        with self._listing_lock:
+            self.files_version += 1
+            self._file_info_cache = None
+            self._file_sort_keys = []
+    
+    def get_file_info(self, file_id: str) -> Optional[Dict[str, Any]]:
         """
-        print(f"Retrieving discovered file: {stored_file.original_name}")
+        Get info for a single file by ID without listing the whole registry
         
-        try:
-            # Download all chunks
-            downloaded_chunks = []
-            
-            for chunk_info in stored_file.chunks:
-                drive_file_id = chunk_info['drive_file_id']
-                drive_account = chunk_info['drive_account']
-                
-                print(f"   Downloading chunk {chunk_info['chunk_index'] + 1}/{len(stored_file.chunks)}")
-                
-                # Download encrypted chunk data
-                encrypted_chunk_data = self.drive_client.download_chunk(drive_account, drive_file_id)
-                downloaded_chunks.append(encrypted_chunk_data)
-            
-            # For discovered files, we concatenate the encrypted chunks and try to decrypt them directly
-            # This is a simplified approach - ideally we'd reconstruct the full manifest
-            print("Attempting to reconstruct discovered file...")
-            
-            # Concatenate all chunks
-            combined_data = b''.join(downloaded_chunks)
+        Args:
+            file_id: ID of file to look up
             
-            # Try to decrypt as a single blob (this might not always work)
-            try:
-                with open(output_path, 'wb') as f:
-                    f.write(combined_data)
-                
-                print(f"Discovered file saved as encrypted data. Manual decryption may be needed.")
-                print(f"   File saved to: {output_path}")
-                return True
-                
-            except Exception as e:
-                print(f"Failed to save discovered file: {e}")
-                return False
-                
-        except Exception as e:
-            print(f"Failed to retrieve discovered file: {e}")
-            return False
-    
-    def list_stored_files(self) -> List[Dict[str, Any]]:
-        """
-        ENHANCED: List all files stored in BrontoBox (including auto-discovered ones)
+        Returns:
+            File info dict (same shape as list_stored_files entries) or None
         """
-        files_info = []
-        
-        for file_id, stored_file in self.stored_files.items():
-            # Enhanced file info with discovery status
-            file_info = {
-                'file_id': file_id,
-                'name': stored_file.original_name,
-                'size_bytes': stored_file.original_size,
-                'size_mb': round(stored_file.original_size / (1024**2), 2),
-                'chunks': len(stored_file.chunks),
-                'accounts_used': stored_file.metadata.get('accounts_used', []),
-                'created_at': stored_file.created_at.isoformat(),
-                'metadata': stored_file.metadata,
-                'is_discovered': stored_file.metadata.get('discovered_from_chunks', False),
-                'encrypted': True
-            }
-            
-            files_info.append(file_info)
-        
-        # Sort by creation date (newest first)
-        files_info.sort(key=lambda x: x['created_at'], reverse=True)
-        
-        return files_info
+        stored_file = self.stored_files.get(file_id)
+        if stored_file is None:
+            return None
+        return self._build_file_info(file_id, stored_file)
+    
+    def _build_file_info(self, file_id: str, stored_file: StoredFile) -> Dict[str, Any]:
+        """Build the file info dict exposed by the API, with discovery status"""
+        return {
+            'file_id': file_id,
+            'name': stored_file.original_name,
+            'size_bytes': stored_file.original_size,
+            'size_mb': round(stored_file.original_size / (1024**2), 2),
+            'chunks': len(stored_file.chunks),
+            'accounts_used': stored_file.metadata.get('accounts_used', []),
+            'created_at': stored_file.created_at.isoformat(),
+            'metadata': stored_file.metadata,
+            'is_discovered': stored_file.metadata.get('discovered_from_chunks', False),
+            'encrypted': True
+        }
     
     def get_unified_brontobox_files(self) -> List[Dict[str, Any]]:
         """
@@ -639,6 +698,7 @@ class BrontoBoxStorageManager:
         discovered_files = {k: v for k, v in self.stored_files.items() 
                           if not v.metadata.get('discovered_from_chunks', False)}
         self.stored_files = discovered_files
+        self.mark_files_changed()
         
         # Re-run auto-scan
         self.auto_scan_existing_files()
@@ -661,66 +721,53 @@ class BrontoBoxStorageManager:
             print(f"File not found: {file_id}")
             return False
         
-        stored_file = self.stored_files[file_id]
-        print(f"Deleting file {stored_file.original_name} ({len(stored_file.chunks)} chunks)")
-        
-        # Delete all chunks from Google Drive
-        deleted_chunks = 0
+        return self.delete_files([file_id]).get(file_id, False)
+    
+    def delete_files(self, file_ids: List[str]) -> Dict[str, bool]:
+        """
+        Delete several files from BrontoBox storage
+        Chunks of all the files are grouped per account, so each account gets
+        batch delete requests for everything at once, with accounts in parallel
         
-        for chunk_info in stored_file.chunks:
-            drive_file_id = chunk_info['drive_file_id']
-            drive_account = chunk_info['drive_account']
+        Args:
+            file_ids: IDs of files to delete (unknown IDs are skipped)
             
-            try:
-                success = self.drive_client.delete_chunk(drive_account, drive_file_id)
-                if success:
-                    deleted_chunks += 1
-                    print(f"   Deleted chunk {chunk_info['chunk_index']}")
-                else:
-                    print(f"   Failed to delete chunk {chunk_info['chunk_index']}")
-            except Exception as e:
-                print(f"   Error deleting chunk {chunk_info['chunk_index']}: {e}")
-        
-        # Remove from stored files
-        del self.stored_files[file_id]
+        Returns:
+            Mapping of file ID to whether all of its chunks were deleted
+        """
+        stored_files = {file_id: self.stored_files[file_id] for file_id in file_ids if file_id in self.stored_files}
         
-        print(f"File deleted: {deleted_chunks}/{len(stored_file.chunks)} chunks removed")
-        return deleted_chunks == len(stored_file.chunks)
-    
-    def get_storage_summary(self) -> Dict[str, Any]:
-        """Get summary of BrontoBox storage usage"""
-        accounts_info = self.get_available_accounts()
-        files_info = self.list_stored_files()
+        chunks_by_account: Dict[str, List[Dict[str, Any]]] = {}
+        for stored_file in stored_files.values():
+            print(f"Deleting file {stored_file.original_name} ({len(stored_file.chunks)} chunks)")
+            for chunk_info in stored_file.chunks:
+                chunks_by_account.setdefault(chunk_info['drive_account'], []).append(chunk_info)
         
-        total_files = len(files_info)
-        total_size_bytes = sum(f['size_bytes'] for f in files_info)
-        total_chunks = sum(f['chunks'] for f in files_info)
-        discovered_files = sum(1 for f in files_info if f.get('is_discovered', False))
+        def delete_account_chunks(drive_account: str) -> Dict[str, bool]:
+            account_chunks = chunks_by_account[drive_account]
+            try:
+                return self.drive_client.delete_chunks(
+                    drive_account, [chunk_info['drive_file_id'] for chunk_info in account_chunks]
+                )
+            except Exception as e:
+                print(f"   Error deleting chunks from {drive_account}: {e}")
+                return {}
         
-        # Account usage
-        total_available_gb = sum(acc['available_gb'] for acc in accounts_info)
-        total_capacity_gb = sum(acc['storage_info']['total_gb'] for acc in accounts_info)
-        total_used_gb = total_capacity_gb - total_available_gb
+        deleted_ids = set()
+        for results in DRIVE_EXECUTOR.map(delete_account_chunks, list(chunks_by_account)):
+            deleted_ids.update(drive_file_id for drive_file_id, ok in results.items() if ok)
         
-        return {
-            'brontobox_files': {
-                'count': total_files,
-                'discovered_count': discovered_files,
-                'uploaded_count': total_files - discovered_files,
-                'total_size_bytes': total_size_bytes,
-                'total_size_gb': round(total_size_bytes / (1024**3), 2),
-                'total_chunks': total_chunks
-            },
-            'google_accounts': {
-                'count': len(accounts_info),
-                'total_capacity_gb': round(total_capacity_gb, 2),
-                'total_used_gb': round(total_used_gb, 2),
-                'total_available_gb': round(total_available_gb, 2),
-                'usage_percentage': round((total_used_gb / total_capacity_gb * 100), 2) if total_capacity_gb > 0 else 0
-            },
-            'accounts': accounts_info,
-            'files': files_info[:5]  # Show first 5 files
-        }
+        outcome = {}
+        for file_id, stored_file in stored_files.items():
+            deleted_chunks = sum(1 for chunk_info in stored_file.chunks if chunk_info['drive_file_id'] in deleted_ids)
+            
+            # Remove from stored files (a concurrent delete may have got here first)
+            if self.stored_files.pop(file_id, None) is not None:
+                self._file_removed(file_id, stored_file)
+            
+            print(f"File deleted: {deleted_chunks}/{len(stored_file.chunks)} chunks removed")
+            outcome[file_id] = deleted_chunks == len(stored_file.chunks)
+        return outcome
     
     def save_file_registry(self) -> Dict[str, Any]:
         """
@@ -731,15 +778,16 @@ class BrontoBoxStorageManager:
             raise RuntimeError("Vault must be unlocked to save registry")
         
         registry_data = {
-            'stored_files': {fid: sf.to_dict() for fid, sf in self.stored_files.items()},
+            # Snapshot the items first: this may run in a worker thread while files change
+            'stored_files': {fid: sf.to_dict() for fid, sf in list(self.stored_files.items())},
             'saved_at': datetime.now().isoformat(),
             'brontobox_version': '1.0'
         }
         
         # Encrypt registry
-        encrypted_registry = self.vault.crypto_manager.encrypt_data(
-            json.dumps(registry_data).encode('utf-8'),
-            self.vault.master_keys['metadata_encryption']
+        encrypted_registry = self.vault.encrypt_with_key(
+            'metadata_encryption',
+            orjson.dumps(registry_data, option=orjson.OPT_NON_STR_KEYS)
         )
         
         return encrypted_registry
@@ -759,39 +807,91 @@ class BrontoBoxStorageManager:
         
         try:
             # Decrypt registry
-            registry_json = self.vault.crypto_manager.decrypt_data(
-                encrypted_registry,
-                self.vault.master_keys['metadata_encryption']
+            registry_json = self.vault.decrypt_with_key(
+                'metadata_encryption',
+                encrypted_registry
             )
             
-            registry_data = json.loads(registry_json.decode('utf-8'))
+            registry_data = orjson.loads(registry_json)
             
             # Restore stored files with COMPLETE metadata
             loaded_files = {}
             for file_id, file_data in registry_data['stored_files'].items():
-                stored_file = StoredFile.from_dict(file_data)
-                
-                # CRITICAL: Mark as properly imported, not discovered
-                stored_file.metadata['discovered_from_chunks'] = False
-                stored_file.metadata['imported_from_registry'] = True
-                stored_file.metadata['import_timestamp'] = datetime.now().isoformat()
-                
-                # Ensure we have encrypted_manifest for downloads
-                if 'encrypted_manifest' not in stored_file.metadata:
-                    print(f"Warning: File {stored_file.original_name} missing encrypted_manifest")
-                    # Try to mark it as discovered so it uses alternative retrieval
-                    stored_file.metadata['discovered_from_chunks'] = True
-                    stored_file.metadata['needs_alternative_retrieval'] = True
-                
-                loaded_files[file_id] = stored_file
+                loaded_files[file_id] = self._restore_stored_file(file_data)
             
             # CLEAR auto-discovered files and replace with imported ones
             print(f"Replacing {len(self.stored_files)} auto-discovered files with {len(loaded_files)} imported files")
             self.stored_files = loaded_files
+            self.mark_files_changed()
             
             print(f"Registry loaded: {len(loaded_files)} files imported with complete metadata")
             return True
             
         except Exception as e:
             print(f"Failed to load file registry: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def _restore_stored_file(self, file_data: Dict[str, Any]) -> StoredFile:
+        """Rebuild a StoredFile from registry data, marked as imported"""
+        stored_file = StoredFile.from_dict(file_data)
+        
+        # CRITICAL: Mark as properly imported, not discovered
+        stored_file.metadata['discovered_from_chunks'] = False
+        stored_file.metadata['imported_from_registry'] = True
+        stored_file.metadata['import_timestamp'] = datetime.now().isoformat()
+        
+        # Ensure we have encrypted_manifest for downloads
+        if 'encrypted_manifest' not in stored_file.metadata:
+            print(f"Warning: File {stored_file.original_name} missing encrypted_manifest")
+            # Try to mark it as discovered so it uses alternative retrieval
+            stored_file.metadata['discovered_from_chunks'] = True
+            stored_file.metadata['needs_alternative_retrieval'] = True
+        
+        return stored_file
+    
+    def encrypt_registry_entry(self, file_id: str) -> Dict[str, Any]:
+        """
+        Encrypt a registry journal entry recording the current state of one file
+        
+        Args:
+            file_id: ID of the file that was added or removed
+            
+        Returns:
+            Encrypted entry - an 'add' with the file record, or a 'del' if it is gone
+        """
+        if not self.vault.is_unlocked:
+            raise RuntimeError("Vault must be unlocked to save registry")
+        
+        stored_file = self.stored_files.get(file_id)
+        if stored_file:
+            entry = {'op': 'add', 'file_id': file_id, 'file': stored_file.to_dict()}
+        else:
+            entry = {'op': 'del', 'file_id': file_id}
+        
+        return self.vault.encrypt_with_key('metadata_encryption', orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS))
+    
+    def replay_registry_journal(self, encrypted_entries: List[Dict[str, Any]]) -> int:
+        """
+        Apply registry journal entries on top of the loaded registry snapshot
+        
+        Args:
+            encrypted_entries: Encrypted entries in the order they were written
+            
+        Returns:
+            Number of entries applied
+        """
+        if not self.vault.is_unlocked:
+            raise RuntimeError("Vault must be unlocked to load registry")
+        
+        applied = 0
+        for encrypted_entry in encrypted_entries:
+            entry = orjson.loads(self.vault.decrypt_with_key('metadata_encryption', encrypted_entry))
+            if entry['op'] == 'add':
+                self.stored_files[entry['file_id']] = self._restore_stored_file(entry['file'])
+            else:
+                self.stored_files.pop(entry['file_id'], None)
+            applied += 1
+        
+        if applied:
+            self.mark_files_changed()
+        return applied
\ No newline at end of file
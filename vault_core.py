@@ -4,15 +4,76 @@ VaultDrive Core System - SECURE VERSION
 Main orchestrator for encryption and file operations with proper password verification
 """
 
-import json
+import orjson
 import os
 import base64
 import hashlib
 import secrets
-from typing import Dict, Any, Optional
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, Iterator
 from crypto_manager import CryptoManager
 from file_chunker import FileChunker
 
+# Keys derived by a successful unlock are kept for a few seconds so an immediate
+# re-unlock with the same password and salt (app reconnect) skips PBKDF2. Only
+# unlocks that ask for it (unlock_vault(remember=True), i.e. the real /vault/unlock)
+# and succeed are cached, so wrong passwords always pay the full cost and
+# throwaway vaults built to validate or restore a backup leave nothing behind.
+# Cached key bytes are zeroed when they expire, are evicted, or any lock_vault()
+# clears the cache. The trade-off: for up to UNLOCK_CACHE_TTL seconds after an
+# unlock, key material also lives here.
+UNLOCK_CACHE_TTL = 10  # seconds
+UNLOCK_CACHE_SIZE = 32
+_recent_unlocks: Dict[bytes, tuple] = {}
+_recent_unlocks_lock = threading.Lock()
+
+def _unlock_cache_key(master_password: str, salt: bytes) -> bytes:
+    return hashlib.sha256(salt + master_password.encode('utf-8')).digest()
+
+def _wipe_unlock(entry: tuple):
+    """Overwrite a cache entry's key bytes in place"""
+    for key in entry[1].values():
+        key[:] = bytes(len(key))
+
+def _get_recent_unlock(cache_key: bytes) -> Optional[Dict[str, bytes]]:
+    with _recent_unlocks_lock:
+        entry = _recent_unlocks.get(cache_key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            _wipe_unlock(_recent_unlocks.pop(cache_key))
+            return None
+        return {name: bytes(key) for name, key in entry[1].items()}
+
+def _expire_recent_unlock(cache_key: bytes, entry: tuple):
+    """Timer callback: drop and wipe an entry once its TTL is up"""
+    with _recent_unlocks_lock:
+        if _recent_unlocks.get(cache_key) is entry:
+            del _recent_unlocks[cache_key]
+        _wipe_unlock(entry)
+
+def _remember_unlock(cache_key: bytes, master_keys: Dict[str, bytes]):
+    with _recent_unlocks_lock:
+        old = _recent_unlocks.pop(cache_key, None)
+        if old is not None:
+            _wipe_unlock(old)
+        if len(_recent_unlocks) >= UNLOCK_CACHE_SIZE:
+            _wipe_unlock(_recent_unlocks.pop(next(iter(_recent_unlocks))))
+        entry = (time.monotonic() + UNLOCK_CACHE_TTL,
+                 {name: bytearray(key) for name, key in master_keys.items()})
+        _recent_unlocks[cache_key] = entry
+    timer = threading.Timer(UNLOCK_CACHE_TTL, _expire_recent_unlock, (cache_key, entry))
+    timer.daemon = True
+    timer.start()
+
+def forget_recent_unlocks():
+    """Drop and wipe all cached key derivations"""
+    with _recent_unlocks_lock:
+        for entry in _recent_unlocks.values():
+            _wipe_unlock(entry)
+        _recent_unlocks.clear()
+
 
 class VaultCore:
     """
@@ -24,6 +85,7 @@ class VaultCore:
         self.file_chunker = FileChunker(self.crypto_manager)
         self.is_unlocked = False
         self.master_keys: Optional[Dict[str, bytes]] = None
+        self._ciphers: Dict[str, Any] = {}  # AES-GCM ciphers per master key, built at unlock
         self.user_salt: Optional[bytes] = None
         self.vault_id: Optional[str] = None
         
@@ -40,7 +102,7 @@ class VaultCore:
         self.user_salt = self.crypto_manager.generate_salt()
         
         # Derive master keys
-        self.master_keys = self.crypto_manager.derive_master_keys(master_password, self.user_salt)
+        self._set_master_keys(self.crypto_manager.derive_master_keys(master_password, self.user_salt))
         
         # Generate unique vault ID
         self.vault_id = f"vault_{secrets.token_hex(16)}"
@@ -62,17 +124,21 @@ class VaultCore:
         }
     
     def unlock_vault(self, master_password: str, salt_b64: str, 
-                    verification_data: Dict[str, Any] = None) -> bool:
+                    verification_data: Dict[str, Any] = None, remember: bool = False) -> bool:
         """
         Unlock existing vault with master password and salt
         NOW WITH PROPER VERIFICATION!
+        remember caches the derived keys briefly for a quick re-unlock
         """
         try:
             # Decode salt
             self.user_salt = base64.b64decode(salt_b64)
             
-            # Derive keys from password
-            test_keys = self.crypto_manager.derive_master_keys(master_password, self.user_salt)
+            # Derive keys from password (or reuse a derivation from a moment ago)
+            cache_key = _unlock_cache_key(master_password, self.user_salt)
+            test_keys = _get_recent_unlock(cache_key)
+            if test_keys is None:
+                test_keys = self.crypto_manager.derive_master_keys(master_password, self.user_salt)
             
             # CRITICAL: Verify this is the correct password/salt combination
             if verification_data:
@@ -82,8 +148,10 @@ class VaultCore:
                     return False
             
             # If verification passes, set the keys and unlock
-            self.master_keys = test_keys
+            self._set_master_keys(test_keys)
             self.is_unlocked = True
+            if verification_data and remember:
+                _remember_unlock(cache_key, test_keys)
             
             print("✅ Vault unlocked with verified credentials")
             return True
@@ -93,6 +161,23 @@ class VaultCore:
             self.is_unlocked = False
             return False
     
+    def _set_master_keys(self, master_keys: Dict[str, bytes]):
+        """Store derived keys and expand each key schedule once for the whole session"""
+        self.master_keys = master_keys
+        self._ciphers = {name: self.crypto_manager.create_cipher(key) for name, key in master_keys.items()}
+    
+    def encrypt_with_key(self, key_name: str, data: bytes) -> Dict[str, Any]:
+        """Encrypt data with one of the master keys, reusing its cached cipher"""
+        if not self.is_unlocked or not self.master_keys:
+            raise RuntimeError("Vault must be unlocked before encrypting data")
+        return self.crypto_manager.encrypt_data(data, self.master_keys[key_name], self._ciphers.get(key_name))
+    
+    def decrypt_with_key(self, key_name: str, encrypted_data: Dict[str, Any]) -> bytes:
+        """Decrypt data with one of the master keys, reusing its cached cipher"""
+        if not self.is_unlocked or not self.master_keys:
+            raise RuntimeError("Vault must be unlocked before decrypting data")
+        return self.crypto_manager.decrypt_data(encrypted_data, self.master_keys[key_name], self._ciphers.get(key_name))
+    
     def _create_verification_data(self, master_password: str) -> Dict[str, Any]:
         """
         Create verification data to prove password/salt correctness later
@@ -110,8 +195,9 @@ class VaultCore:
         
         # Encrypt verification payload with vault_unlock key
         encrypted_verification = self.crypto_manager.encrypt_data(
-            json.dumps(verification_payload).encode('utf-8'),
-            self.master_keys['vault_unlock']
+            orjson.dumps(verification_payload),
+            self.master_keys['vault_unlock'],
+            self._ciphers.get('vault_unlock')
         )
         
         return encrypted_verification
@@ -128,7 +214,7 @@ class VaultCore:
                 test_keys['vault_unlock']
             )
             
-            verification_payload = json.loads(decrypted_data.decode('utf-8'))
+            verification_payload = orjson.loads(decrypted_data)
             
             # Verify the decrypted data is valid
             if verification_payload.get('prefix') != self.VERIFICATION_PREFIX:
@@ -157,32 +243,60 @@ class VaultCore:
     
     def lock_vault(self):
         """Lock the vault and clear sensitive data from memory"""
+        forget_recent_unlocks()
         self.is_unlocked = False
         self.master_keys = None
+        self._ciphers = {}
         self.user_salt = None
         self.vault_id = None
     
-    def encrypt_file(self, file_path: str) -> Dict[str, Any]:
+    def encrypt_file(self, file_path: str, file_name: str = None) -> Dict[str, Any]:
         """
         Encrypt and chunk a file for distributed storage
         Returns manifest for storage and reconstruction
+        file_name overrides the recorded name, e.g. for uploads spilled to a temp file
         """
         if not self.is_unlocked or not self.master_keys:
             raise RuntimeError("Vault must be unlocked before encrypting files")
         
-        # Use file encryption key
-        encryption_key = self.master_keys['file_encryption']
+        # Chunk and encrypt file with the file encryption key
+        manifest = self.file_chunker.chunk_file(
+            file_path,
+            self.master_keys['file_encryption'],
+            self._ciphers.get('file_encryption'),
+            file_name
+        )
         
-        # Chunk and encrypt file
-        manifest = self.file_chunker.chunk_file(file_path, encryption_key)
+        return self._seal_manifest(manifest)
+    
+    def encrypt_bytes(self, data: bytes, file_name: str) -> Dict[str, Any]:
+        """
+        Encrypt and chunk in-memory data for distributed storage
+        Returns the same structure as encrypt_file
+        """
+        if not self.is_unlocked or not self.master_keys:
+            raise RuntimeError("Vault must be unlocked before encrypting files")
         
-        # Encrypt manifest metadata with metadata key
-        manifest_json = json.dumps(manifest, indent=2)
-        encrypted_manifest = self.crypto_manager.encrypt_data(
-            manifest_json.encode('utf-8'),
-            self.master_keys['metadata_encryption']
+        manifest = self.file_chunker.chunk_bytes(
+            data,
+            file_name,
+            self.master_keys['file_encryption'],
+            self._ciphers.get('file_encryption')
         )
         
+        return self._seal_manifest(manifest)
+    
+    def _seal_manifest(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """Encrypt a chunk manifest with the metadata key and package the result"""
+        # The chunk ciphertext is left out: it lives in Drive and is fetched
+        # again on download, so embedding it (base64, then encrypted and
+        # base64'd again) only bloats the file registry and every file listing.
+        persisted_manifest = dict(manifest, chunks=[
+            dict(chunk, encrypted_data={k: v for k, v in chunk['encrypted_data'].items() if k != 'ciphertext'})
+            for chunk in manifest['chunks']
+        ])
+        encrypted_manifest = self.encrypt_with_key('metadata_encryption', orjson.dumps(persisted_manifest))
+        
         return {
             'file_manifest': manifest,
             'encrypted_manifest': encrypted_manifest,
@@ -190,29 +304,40 @@ class VaultCore:
             'total_size': manifest['file_size']
         }
     
-    def decrypt_file(self, encrypted_manifest: Dict[str, Any], output_path: str) -> bool:
+    def decrypt_file(self, encrypted_manifest: Dict[str, Any], output_path: str,
+                     fetch_chunk: Optional[Callable[[int], bytes]] = None) -> bool:
         """
         Decrypt and reconstruct a file from encrypted manifest
+        The plaintext file_manifest (with chunk ciphertext) is used when present.
+        A sealed encrypted_manifest no longer carries the ciphertext, so on its own
+        it needs fetch_chunk(chunk_index) to supply each chunk's raw ciphertext.
         """
         if not self.is_unlocked or not self.master_keys:
             raise RuntimeError("Vault must be unlocked before decrypting files")
         
-        try:
-            # If we have an encrypted manifest, decrypt it first
-            if 'encrypted_manifest' in encrypted_manifest:
-                manifest_data = self.crypto_manager.decrypt_data(
-                    encrypted_manifest['encrypted_manifest'],
-                    self.master_keys['metadata_encryption']
-                )
-                manifest = json.loads(manifest_data.decode('utf-8'))
-            else:
-                manifest = encrypted_manifest['file_manifest']
+        if 'file_manifest' not in encrypted_manifest:
+            if 'encrypted_manifest' not in encrypted_manifest:
+                raise ValueError("Manifest has neither file_manifest nor encrypted_manifest")
+            if fetch_chunk is None:
+                raise ValueError("A sealed manifest holds no chunk data; pass fetch_chunk to decrypt it")
             
+            blocks = self.iter_decrypt_file(encrypted_manifest['encrypted_manifest'], fetch_chunk)
+            try:
+                with open(output_path, 'wb') as f:
+                    for block in blocks:
+                        f.write(block)
+                return True
+            except Exception as e:
+                print(f"File decryption failed: {e}")
+                return False
+        
+        try:
             # Reconstruct file using file encryption key
             success = self.file_chunker.reconstruct_file(
-                manifest, 
+                encrypted_manifest['file_manifest'], 
                 output_path, 
-                self.master_keys['file_encryption']
+                self.master_keys['file_encryption'],
+                self._ciphers.get('file_encryption')
             )
             
             return success
@@ -221,6 +346,26 @@ class VaultCore:
             print(f"File decryption failed: {e}")
             return False
     
+    def iter_decrypt_file(self, encrypted_manifest: Dict[str, Any],
+                          fetch_chunk: Callable[[int], bytes]) -> Iterator[bytes]:
+        """
+        Decrypt a file chunk by chunk without writing it to disk
+        fetch_chunk(chunk_index) must return the raw ciphertext of that chunk
+        The manifest is decrypted up front so bad keys fail before anything is streamed
+        """
+        if not self.is_unlocked or not self.master_keys:
+            raise RuntimeError("Vault must be unlocked before decrypting files")
+        
+        manifest_data = self.decrypt_with_key('metadata_encryption', encrypted_manifest)
+        manifest = orjson.loads(manifest_data)
+        
+        return self.file_chunker.iter_decrypted_chunks(
+            manifest,
+            self.master_keys['file_encryption'],
+            fetch_chunk,
+            self._ciphers.get('file_encryption')
+        )
+    
     def get_vault_status(self) -> Dict[str, Any]:
         """Get current vault status"""
         return {
@@ -230,6 +375,3 @@ class VaultCore:
             'encryption_algorithm': 'AES-256-GCM',
             'key_derivation': 'PBKDF2-SHA256'
         }
-
-# Add missing import
-import time
\ No newline at end of file